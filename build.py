@@ -14,6 +14,10 @@ LICENSE="GNU General Public License v3.0"
 UNUSED_FILES: list[Path] = [
     DIST_FOLDER / "assets" / "config.json",
     DIST_FOLDER / "assets" / "dictionary.json",
+    DIST_FOLDER / "assets" / "detection_cache.json",
+    DIST_FOLDER / "assets" / "scan_index.json",
+    DIST_FOLDER / "assets" / "archive_cache.db",
+    DIST_FOLDER / "assets" / "log.txt",
 ]
 
 print("Building with nuitka...")
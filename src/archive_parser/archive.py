@@ -3,17 +3,16 @@ Copyright (c) Cutleast
 """
 
 from dataclasses import dataclass
-from fnmatch import fnmatch
 from io import BufferedReader
 from pathlib import Path
 
-import lz4.frame
-
+from .compression import Compression, decompress
 from .datatypes import *
 from .file_name_block import FileNameBlock
 from .file_record import FileRecord, FileRecordBlock
 from .folder_record import FolderRecord
 from .header import Header
+from .utilities import compile_glob, normalize_path
 
 
 @dataclass
@@ -26,20 +25,58 @@ class Archive:
     data_stream: BufferedReader
     parsed_data = None
 
+    # Oblivion, Skyrim LE, Skyrim SE
+    SUPPORTED_VERSIONS = (103, 104, 105)
+
     def match_names(self):
         """
-        Matches file names to their records.
+        Matches full file paths (folder\\file) to their records.
         """
 
         result: dict[str, FileRecord] = {}
 
         index = 0
         for file_record_block in self.file_record_blocks:
+            folder = file_record_block.name.rstrip(b"\x00").decode()
+
             for file_record in file_record_block.file_records:
-                result[self.file_name_block.file_names[index]] = file_record
+                file_name = self.file_name_block.file_names[index]
+                result[normalize_path(f"{folder}\\{file_name}")] = file_record
                 index += 1
 
         return result
+
+    def map_hashes(self):
+        """
+        Maps folder hashes to their file record blocks
+        and file hashes in each block to their records.
+        """
+
+        result: dict[int, dict[int, FileRecord]] = {}
+
+        for folder, file_record_block in zip(self.folders, self.file_record_blocks):
+            result[folder.name_hash] = {
+                file_record.name_hash: file_record
+                for file_record in file_record_block.file_records
+            }
+
+        return result
+
+    def get_file_record(self, path: str):
+        """
+        Returns record of file at <path> by its hashes
+        without using the file names.
+        """
+
+        folder, _, file_name = normalize_path(path).rpartition("\\")
+
+        folder_files = self.hashes.get(Hash.calc_hash(folder, folder=True), {})
+        file_record = folder_files.get(Hash.calc_hash(file_name))
+
+        if file_record is None:
+            raise FileNotFoundError("File is not in archive!")
+
+        return file_record
     
     def process_compression_flags(self):
         """
@@ -54,20 +91,51 @@ class Archive:
             else:
                 file_record.compressed = self.header.archive_flags["Compressed Archive"]
 
+    @property
+    def compression(self):
+        """
+        Compression format of compressed files.
+        """
+
+        if self.header.version >= 105:
+            return Compression.LZ4_FRAME
+
+        return Compression.ZLIB
+
+    @property
+    def embed_file_names(self):
+        """
+        Whether file names are stored in front of the file data.
+        Oblivion archives (v103) use this flag for something else.
+        """
+
+        return self.header.version > 103 and self.header.archive_flags["Embed File Names"]
+
     def parse(self):
         self.header = Header(self.data_stream).parse()
-        self.folders = [
-            FolderRecord(self.data_stream).parse()
-            for i in range(self.header.folder_count)
-        ]
+
+        if self.header.file_id != b"BSA\x00":
+            raise ValueError(f"Not a BSA archive: {self.archive_path}")
+
+        if self.header.version not in self.SUPPORTED_VERSIONS:
+            raise NotImplementedError(
+                f"BSA version {self.header.version} is not supported!"
+            )
+
+        self.folders = FolderRecord.parse_block(
+            self.data_stream, self.header.folder_count, self.header.version
+        )
         self.file_record_blocks = [
             FileRecordBlock(self.data_stream).parse(
                 self.folders[i].count
             )
             for i in range(len(self.folders))
         ]
-        self.file_name_block = FileNameBlock(self.data_stream).parse(self.header.file_count)
+        self.file_name_block = FileNameBlock(self.data_stream).parse(
+            self.header.file_count, self.header.total_file_name_length
+        )
         self.files = self.match_names()
+        self.hashes = self.map_hashes()
 
         self.process_compression_flags()
 
@@ -79,33 +147,28 @@ class Archive:
         match the <pattern>.
 
         Parameters:
-            pattern: str, everything that fnmatch supports
-        
+            pattern: str, everything that fnmatch supports,
+                matched case-insensitive against full paths
+
         Returns:
-            list of matching filenames
+            list of matching file paths
         """
 
-        matching_files: list[Path] = []
-        
-        # Normalize pattern
-        pattern = str(Path(pattern))
-
-        for file in self.files:
-            # Normalize file path
-            filepath = str(Path(file))
+        # Exact paths are looked up by their hashes
+        if not any(char in pattern for char in "*?["):
+            try:
+                self.get_file_record(pattern)
+            except FileNotFoundError:
+                return []
 
-            if fnmatch(filepath, pattern):
-                matching_files.append(Path(file))
+            return [Path(normalize_path(pattern))]
 
-        return matching_files
-    
-    def extract_file(self, filename: str | Path, dest_folder: Path):
-        filename = Path(filename).name
+        regex = compile_glob(pattern)
 
-        if filename not in self.files:
-            raise FileNotFoundError("File is not in archive!")
+        return [Path(file) for file in self.files if regex.match(file)]
 
-        file_record = self.files[filename]
+    def extract_file(self, filename: str | Path, dest_folder: Path):
+        file_record = self.get_file_record(str(filename))
 
         # Get current index
         cur_index = self.data_stream.tell()
@@ -113,15 +176,18 @@ class Archive:
         # Go to file raw data
         self.data_stream.seek(file_record.offset)
 
-        if self.header.archive_flags["Embed File Names"]:
+        size = file_record.size & 0x3FFFFFFF
+
+        if self.embed_file_names:
             filename = String.bstring(self.data_stream).decode(errors="ignore")
+            size -= len(filename) + 1
 
         if file_record.compressed:
             original_size = Integer.ulong(self.data_stream)
-            data = self.data_stream.read(file_record.size-4)
-            data = lz4.frame.decompress(data)
+            data = self.data_stream.read(size - 4)
+            data = decompress(data, self.compression, original_size)
         else:
-            data = self.data_stream.read(file_record.size)
+            data = self.data_stream.read(size)
 
         destination = dest_folder / filename
         os.makedirs(destination.parent, exist_ok=True)
@@ -0,0 +1,172 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+import sqlite3
+import struct
+from pathlib import Path
+
+from .compression import Compression
+from .indexed_archive import IndexedArchive
+
+
+class ArchiveCache:
+    """
+    Class for persisting file tables of indexed archives.
+
+    File tables are stored in an SQLite database and keyed by
+    the path, size and modification time of the archive.
+    Unchanged archives can be indexed without opening them.
+    """
+
+    # Increase when the stored file tables change
+    CACHE_VERSION = 3
+
+    # Offset, size, compression, original size of a file
+    FILE_RECORD = struct.Struct("<QIBI")
+
+    # Maximum number of parameters per query
+    MAX_PARAMETERS = 500
+
+    cache_path: Path = None
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+
+    def connect(self):
+        """
+        Opens database and creates table if it does not exist.
+        Connections are only valid in the thread they are opened in.
+        """
+
+        connection = sqlite3.connect(self.cache_path)
+
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.CACHE_VERSION:
+            connection.execute("DROP TABLE IF EXISTS archives")
+            connection.execute(f"PRAGMA user_version = {self.CACHE_VERSION}")
+
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS archives (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime INTEGER,
+                embed_file_names INTEGER,
+                size_prefix INTEGER,
+                names TEXT,
+                records BLOB
+            )
+            """
+        )
+
+        return connection
+
+    @staticmethod
+    def get_key(archive_path: Path):
+        """
+        Returns path, size and modification time of <archive_path>.
+        """
+
+        stat = os.stat(archive_path)
+
+        return str(archive_path), stat.st_size, stat.st_mtime_ns
+
+    def load(self, archive_paths: list[Path]):
+        """
+        Returns cached file tables of <archive_paths>
+        that did not change since they were stored.
+        """
+
+        keys = {}
+        for archive_path in archive_paths:
+            try:
+                keys[str(archive_path)] = (archive_path, *self.get_key(archive_path))
+            except OSError:
+                continue
+
+        archives: dict[Path, IndexedArchive] = {}
+
+        paths = list(keys)
+        rows: list[tuple] = []
+
+        connection = self.connect()
+        try:
+            # Only the requested archives are selected, in chunks below
+            # the limit of SQLite for the number of parameters
+            for i in range(0, len(paths), self.MAX_PARAMETERS):
+                chunk = paths[i : i + self.MAX_PARAMETERS]
+                rows += connection.execute(
+                    "SELECT path, size, mtime, embed_file_names, size_prefix, "
+                    "names, records FROM archives "
+                    f"WHERE path IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+        finally:
+            connection.close()
+
+        for row in rows:
+            path, size, mtime, embed_file_names, size_prefix, names, records = row
+
+            archive_path, _, cur_size, cur_mtime = keys[path]
+            if (size, mtime) != (cur_size, cur_mtime):
+                continue
+
+            files = dict(
+                zip(
+                    names.split("\0") if names else [],
+                    (
+                        (offset, file_size, Compression(compression), orig_size)
+                        for offset, file_size, compression, orig_size in (
+                            self.FILE_RECORD.iter_unpack(records)
+                        )
+                    ),
+                )
+            )
+            archives[archive_path] = IndexedArchive(
+                archive_path, bool(embed_file_names), bool(size_prefix), files
+            )
+
+        return archives
+
+    def store(self, archives: list[IndexedArchive]):
+        """
+        Stores file tables of <archives>.
+        """
+
+        rows = []
+        for archive in archives:
+            try:
+                path, size, mtime = self.get_key(archive.archive_path)
+            except OSError:
+                continue
+
+            names = "\0".join(archive.files)
+            records = b"".join(
+                self.FILE_RECORD.pack(*file_record)
+                for file_record in archive.files.values()
+            )
+            rows.append(
+                (
+                    path,
+                    size,
+                    mtime,
+                    int(archive.embed_file_names),
+                    int(archive.size_prefix),
+                    names,
+                    records,
+                )
+            )
+
+        if not rows:
+            return
+
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        finally:
+            connection.close()
@@ -0,0 +1,87 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+from typing import Callable
+
+from .archive_parser import ArchiveParser
+from .ba2_archive import BA2Archive
+from .compression import Compression
+from .indexed_archive import IndexedArchive
+
+# File identifier -> function that indexes archives of that format
+ARCHIVE_FORMATS: dict[bytes, Callable[[Path], IndexedArchive]] = {}
+
+
+def archive_format(file_id: bytes):
+    """
+    Registers decorated function to index archives with <file_id>.
+    """
+
+    def register(func: Callable[[Path], IndexedArchive]):
+        ARCHIVE_FORMATS[file_id] = func
+
+        return func
+
+    return register
+
+
+def index_archive(archive_path: Path):
+    """
+    Detects format of archive at <archive_path> from its header
+    and returns its file table.
+    """
+
+    with open(archive_path, "rb") as file:
+        file_id = file.read(4)
+
+    if file_id not in ARCHIVE_FORMATS:
+        raise NotImplementedError(f"Unsupported archive format: {file_id!r}")
+
+    return ARCHIVE_FORMATS[file_id](archive_path)
+
+
+@archive_format(b"BSA\x00")
+def index_bsa(archive_path: Path):
+    """
+    Indexes BSA archive (v103, v104 and v105).
+    """
+
+    parser = ArchiveParser(archive_path)
+
+    try:
+        archive = parser.parse_archive()
+    finally:
+        parser.close_stream()
+
+    # Only the lower 30 bits are the size,
+    # bit 30 toggles the archive's default compression
+    files = {
+        file_name: (
+            file_record.offset,
+            file_record.size & 0x3FFFFFFF,
+            archive.compression if file_record.compressed else Compression.NONE,
+            0,
+        )
+        for file_name, file_record in archive.files.items()
+    }
+
+    return IndexedArchive(
+        archive_path,
+        embed_file_names=archive.embed_file_names,
+        size_prefix=True,
+        files=files,
+    )
+
+
+@archive_format(b"BTDX")
+def index_ba2(archive_path: Path):
+    """
+    Indexes general BA2 archive (GNRL).
+    """
+
+    with open(archive_path, "rb") as stream:
+        archive = BA2Archive(archive_path, stream).parse()
+
+    return IndexedArchive(archive_path, files=archive.files)
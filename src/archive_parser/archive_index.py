@@ -0,0 +1,149 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+from . import archive_formats
+from .archive_cache import ArchiveCache
+from .archive_member import ArchiveMember
+from .indexed_archive import IndexedArchive
+from .utilities import compile_glob, normalize_path
+
+
+class ArchiveIndex:
+    """
+    Class for indexing multiple archives at once.
+
+    Every archive is parsed only once and closed afterwards.
+    Only a compact table with the offset, size and compression
+    of each file is kept to find files and read them later.
+    The format of each archive (BSA v103 to v105 or general BA2)
+    is detected from its header.
+
+    If a cache is given, file tables of unchanged archives are
+    loaded from it instead of parsing the archives.
+    """
+
+    archives: list[IndexedArchive] = None
+    failed_archives: list[Path] = None
+
+    def __init__(self, archive_paths: list[Path], cache: ArchiveCache = None):
+        self.archives = []
+        self.failed_archives = []
+
+        cached_archives: dict[Path, IndexedArchive] = {}
+        if cache is not None:
+            try:
+                cached_archives = cache.load(archive_paths)
+            except sqlite3.Error:
+                cache = None
+
+        new_archives: list[IndexedArchive] = []
+        for archive_path in archive_paths:
+            if archive_path in cached_archives:
+                self.archives.append(cached_archives[archive_path])
+                continue
+
+            try:
+                archive = self.index_archive(archive_path)
+            except Exception:
+                self.failed_archives.append(archive_path)
+                continue
+
+            self.archives.append(archive)
+            new_archives.append(archive)
+
+        if cache is not None:
+            try:
+                cache.store(new_archives)
+            except sqlite3.Error:
+                pass
+
+    @staticmethod
+    def index_archive(archive_path: Path):
+        """
+        Parses archive at <archive_path> and returns its file table.
+        """
+
+        return archive_formats.index_archive(archive_path)
+
+    def glob(self, patterns: list[str]):
+        """
+        Matches files of all archives against <patterns> in one pass.
+        Each file is only matched by the first matching pattern.
+
+        Parameters:
+            patterns: list of str, everything that fnmatch supports,
+                matched case-insensitive against full paths (folder\\file)
+
+        Returns:
+            list of matching archive members for each pattern
+        """
+
+        regexes = [compile_glob(pattern) for pattern in patterns]
+
+        # Patterns without wildcards are exact paths and are looked up
+        # directly, patterns with a fixed extension only have to be
+        # matched against files with that extension
+        exact_paths: list[str | None] = []
+        extensions: list[str | None] = []
+        for pattern in patterns:
+            path = normalize_path(pattern)
+            if not any(char in path for char in "*?["):
+                exact_paths.append(path)
+            else:
+                exact_paths.append(None)
+
+            extension = os.path.splitext(path)[1]
+            if extension and not any(char in extension for char in "*?["):
+                extensions.append(extension)
+            else:
+                extensions.append(None)
+
+        matches: list[list[ArchiveMember]] = [[] for _ in patterns]
+        matched_files: set[tuple[Path, str]] = set()
+
+        for archive in self.archives:
+            for i, (regex, exact_path, extension) in enumerate(
+                zip(regexes, exact_paths, extensions)
+            ):
+                if exact_path is not None:
+                    file_paths = [exact_path] if exact_path in archive.files else []
+                elif extension is not None:
+                    file_paths = archive.extensions.get(extension, [])
+                else:
+                    file_paths = archive.files
+
+                for file_path in file_paths:
+                    if (archive.archive_path, file_path) in matched_files:
+                        continue
+
+                    if regex.match(file_path):
+                        matched_files.add((archive.archive_path, file_path))
+                        matches[i].append(
+                            self.get_member(archive, file_path)
+                        )
+
+        return matches
+
+    @staticmethod
+    def get_member(archive: IndexedArchive, file_path: str):
+        """
+        Returns member at normalized <file_path> in <archive>.
+        """
+
+        offset, size, compression, original_size = archive.files[file_path]
+
+        return ArchiveMember(
+            archive.archive_path,
+            file_path,
+            offset,
+            size,
+            compression,
+            original_size,
+            archive.embed_file_names,
+            archive.size_prefix,
+        )
@@ -0,0 +1,84 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from dataclasses import dataclass
+from io import BufferedReader
+from pathlib import Path
+
+from .compression import Compression, decompress
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """
+    Class for a file inside an archive.
+
+    Contains everything that is needed to read the file
+    without parsing the archive again and can be pickled
+    to worker processes.
+    """
+
+    archive_path: Path
+
+    # Full path (folder\file) inside the archive
+    file_name: str
+    offset: int
+
+    # Size of the stored data
+    size: int
+    compression: Compression = Compression.NONE
+
+    # Size of the decompressed data, if it is not stored in front of it
+    original_size: int = 0
+
+    embed_file_names: bool = False
+    size_prefix: bool = False
+
+    @property
+    def path(self):
+        """
+        Virtual path of the file inside the archive.
+        """
+
+        return self.archive_path.joinpath(*self.file_name.split("\\"))
+
+    def read(self):
+        """
+        Reads and returns decompressed content of the file.
+        """
+
+        with open(self.archive_path, "rb") as stream:
+            return self.read_from(stream)
+
+    def read_from(self, stream: BufferedReader):
+        """
+        Reads and returns decompressed content of the file
+        from opened archive <stream>.
+        """
+
+        stream.seek(self.offset)
+
+        return self.decode(stream.read(self.size))
+
+    def decode(self, raw_data: bytes):
+        """
+        Returns decompressed content of the file from <raw_data>
+        as it is stored in the archive.
+        """
+
+        start = 0
+        original_size = self.original_size
+
+        # Size includes embedded name
+        if self.embed_file_names:
+            start += 1 + raw_data[0]
+
+        if self.compression == Compression.NONE:
+            return bytes(raw_data[start:])
+
+        if self.size_prefix:
+            original_size = int.from_bytes(raw_data[start : start + 4], "little")
+            start += 4
+
+        return decompress(raw_data[start:], self.compression, original_size)
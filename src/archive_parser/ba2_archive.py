@@ -0,0 +1,102 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import struct
+from dataclasses import dataclass
+from io import BufferedReader
+from pathlib import Path
+
+from .compression import Compression
+from .datatypes import Integer
+from .utilities import normalize_path
+
+
+@dataclass
+class BA2Archive:
+    """
+    Contains parsed data of a general (GNRL) BA2 archive.
+
+    File structure:
+    - Header
+    - File entries
+    - File data
+    - Name table
+    """
+
+    archive_path: Path
+    data_stream: BufferedReader
+
+    # Magic, version, type, file count, name table offset
+    HEADER = struct.Struct("<4sI4sIQ")
+
+    # Name hash, extension, directory hash, flags,
+    # offset, packed size, unpacked size, align
+    FILE_ENTRY = struct.Struct("<I4sIIQIII")
+
+    # Compression format of v3 archives
+    COMPRESSION_FORMATS = {
+        0: Compression.ZLIB,
+        3: Compression.LZ4_BLOCK,
+    }
+
+    def parse_header(self):
+        (
+            self.file_id,
+            self.version,
+            self.type,
+            self.file_count,
+            self.name_table_offset,
+        ) = self.HEADER.unpack(self.data_stream.read(self.HEADER.size))
+
+        if self.file_id != b"BTDX":
+            raise ValueError(f"Not a BA2 archive: {self.archive_path}")
+
+        if self.type != b"GNRL":
+            raise NotImplementedError(
+                f"BA2 type {self.type.decode(errors='replace')!r} is not supported!"
+            )
+
+        self.compression = Compression.ZLIB
+
+        # Starfield archives have additional header fields
+        if self.version in (2, 3):
+            self.data_stream.read(8)
+
+        if self.version == 3:
+            compression_format = Integer.uint32(self.data_stream)
+            self.compression = self.COMPRESSION_FORMATS[compression_format]
+
+    def parse(self):
+        self.parse_header()
+
+        entries = list(
+            self.FILE_ENTRY.iter_unpack(
+                self.data_stream.read(self.FILE_ENTRY.size * self.file_count)
+            )
+        )
+
+        # Name table is read at once and split by the length prefixes
+        self.data_stream.seek(self.name_table_offset)
+        name_table = self.data_stream.read()
+        file_names: list[str] = []
+        pos = 0
+        for _ in range(self.file_count):
+            length = int.from_bytes(name_table[pos : pos + 2], "little")
+            pos += 2
+            file_names.append(name_table[pos : pos + length].decode())
+            pos += length
+
+        # Full file path -> (offset, size, compression, original size)
+        self.files: dict[str, tuple[int, int, Compression, int]] = {}
+        for file_name, entry in zip(file_names, entries):
+            offset, packed_size, unpacked_size = entry[4:7]
+
+            if packed_size:
+                file = (offset, packed_size, self.compression, unpacked_size)
+            else:
+                file = (offset, unpacked_size, Compression.NONE, unpacked_size)
+
+            self.files[normalize_path(file_name)] = file
+
+        return self
@@ -0,0 +1,132 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator
+
+from .archive_member import ArchiveMember
+
+
+class BulkReader:
+    """
+    Class for reading many archive members at once.
+
+    Members are read archive by archive in offset order and
+    neighbouring members are read with a single read call.
+    The data is decompressed in a thread pool since the
+    decompressors release the GIL.
+    """
+
+    # Maximum number of unused bytes between two members read at once
+    max_gap: int = 64 * 1024
+
+    # Maximum size of a single read
+    max_span: int = 16 * 1024 * 1024
+
+    max_workers: int = None
+
+    # Members that failed to read in the last call of `read` and their errors
+    failed: list[tuple[ArchiveMember, Exception]] = None
+
+    def __init__(self, max_workers: int = None):
+        if max_workers is not None:
+            self.max_workers = max_workers
+        else:
+            self.max_workers = min(32, (os.cpu_count() or 1) + 4)
+
+    def get_spans(self, members: list[ArchiveMember]):
+        """
+        Groups <members> of one archive into spans that are read at once.
+        Returns list of (start, end, members) tuples.
+        """
+
+        spans: list[tuple[int, int, list[ArchiveMember]]] = []
+
+        for member in sorted(members, key=lambda member: member.offset):
+            end = member.offset + member.size
+
+            if spans:
+                span_start, span_end, span_members = spans[-1]
+
+                if (
+                    member.offset - span_end <= self.max_gap
+                    and end - span_start <= self.max_span
+                ):
+                    spans[-1] = (span_start, max(span_end, end), span_members)
+                    span_members.append(member)
+                    continue
+
+            spans.append((member.offset, end, [member]))
+
+        return spans
+
+    def read(
+        self, members: list[ArchiveMember]
+    ) -> Iterator[tuple[ArchiveMember, bytes]]:
+        """
+        Reads <members> and yields (member, content) tuples archive by
+        archive in the order they are finished. Members of a span are
+        yielded while the next spans of the archive are read.
+
+        Members that fail to read are skipped and added to `failed`
+        together with the error.
+        """
+
+        self.failed = []
+
+        members_per_archive: dict[Path, list[ArchiveMember]] = {}
+        for member in members:
+            members_per_archive.setdefault(member.archive_path, []).append(member)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for archive_path, archive_members in members_per_archive.items():
+                futures: dict[Future, ArchiveMember] = {}
+                submitted: set[ArchiveMember] = set()
+
+                try:
+                    with open(archive_path, "rb") as stream:
+                        for start, end, span_members in self.get_spans(
+                            archive_members
+                        ):
+                            stream.seek(start)
+                            span = memoryview(stream.read(end - start))
+
+                            for member in span_members:
+                                offset = member.offset - start
+                                raw_data = span[offset : offset + member.size]
+                                future = executor.submit(member.decode, raw_data)
+                                futures[future] = member
+                            submitted.update(span_members)
+
+                            yield from self.collect(futures)
+                except OSError as ex:
+                    # Members of spans that were not read yet
+                    self.failed += [
+                        (member, ex)
+                        for member in archive_members
+                        if member not in submitted
+                    ]
+
+                yield from self.collect(futures, wait=True)
+
+    def collect(self, futures: dict[Future, ArchiveMember], wait: bool = False):
+        """
+        Removes finished <futures> and yields their (member, content) tuples.
+        Waits for all <futures> if <wait> is True.
+        """
+
+        if wait:
+            done = as_completed(list(futures))
+        else:
+            done = [future for future in futures if future.done()]
+
+        for future in done:
+            member = futures.pop(future)
+
+            try:
+                yield member, future.result()
+            except Exception as ex:
+                self.failed.append((member, ex))
@@ -0,0 +1,39 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import zlib
+from enum import IntEnum
+
+import lz4.block
+import lz4.frame
+
+
+class Compression(IntEnum):
+    """
+    Compression formats of files in archives.
+    """
+
+    NONE = 0
+    ZLIB = 1  # BSA v103/v104, BA2
+    LZ4_FRAME = 2  # BSA v105
+    LZ4_BLOCK = 3  # BA2 v3
+
+
+def decompress(data: bytes, compression: Compression, original_size: int):
+    """
+    Decompresses <data> with <compression>.
+    All decompressors release the GIL while decompressing.
+    """
+
+    match compression:
+        case Compression.NONE:
+            return bytes(data)
+        case Compression.ZLIB:
+            return zlib.decompress(data, bufsize=max(original_size, 1))
+        case Compression.LZ4_FRAME:
+            return lz4.frame.decompress(data)
+        case Compression.LZ4_BLOCK:
+            return lz4.block.decompress(data, uncompressed_size=original_size)
+        case _:
+            raise ValueError(f"Unknown compression: {compression!r}")
@@ -108,8 +108,11 @@ class String:
         strings: list[str] = []
 
         while len(strings) < count:
-            string = b""
+            string = bytearray()
             while (char := stream.read(1)) != sep:
+                if not char:
+                    raise EOFError("Unexpected end of stream!")
+
                 string += char
 
             strings.append(string.decode())
@@ -151,31 +154,49 @@ class Hash:
     def hash(stream: BufferedReader):
         return Integer.uint64(stream)
 
-    def calc_hash(filename: str):
+    def calc_hash(path: str, folder: bool = False):
         """
-        Returns tes4's two hash values for filename.
-        Based on TimeSlips code with cleanup and pythonization.
-
-        This function is from here:
-        https://en.uesp.net/wiki/Oblivion_Mod:Hash_Calculation#Python
+        Returns tes4's 64-bit hash of a file name or of a <folder> path
+        as it is stored in folder and file records.
+        Based on the description here:
+        https://en.uesp.net/wiki/Oblivion_Mod:Hash_Calculation
         """
 
-        root,ext = os.path.splitext(filename.lower()) #--"bob.dds" >> root = "bob", ext = ".dds"
-        #--Hash1
-        chars = map(ord,root) #--'bob' >> chars = [98,111,98]
-        hash1 = chars[-1] | (0,chars[-2])[len(chars)>2]<<8 | len(chars)<<16 | chars[0]<<24
-        #--(a,b)[test] is similar to test?a:b in C. (Except that evaluation is not shortcut.)
-        if   ext == '.kf':  hash1 |= 0x80
-        elif ext == '.nif': hash1 |= 0x8000
-        elif ext == '.dds': hash1 |= 0x8080
-        elif ext == '.wav': hash1 |= 0x80000000
-        #--Hash2
-        #--Python integers have no upper limit. Use uintMask to restrict these to 32 bits.
-        uintMask, hash2, hash3 = 0xFFFFFFFF, 0, 0 
-        for char in chars[1:-2]: #--Slice of the chars array
-            hash2 = ((hash2 * 0x1003f) + char ) & uintMask
-        for char in map(ord,ext):
-            hash3 = ((hash3 * 0x1003F) + char ) & uintMask
-        hash2 = (hash2 + hash3) & uintMask
-        #--Done
-        return (hash2<<32) + hash1 #--Return as uint64
+        path = path.replace("/", "\\").lower()
+
+        if folder:
+            root, ext = path, ""
+        else:
+            root, ext = os.path.splitext(path)
+
+        if not root:
+            return 0
+
+        chars = [ord(char) for char in root]
+
+        hash1 = chars[-1] | len(chars) << 16 | chars[0] << 24
+        if len(chars) > 2:
+            hash1 |= chars[-2] << 8
+
+        if ext == ".kf":
+            hash1 |= 0x80
+        elif ext == ".nif":
+            hash1 |= 0x8000
+        elif ext == ".dds":
+            hash1 |= 0x8080
+        elif ext == ".wav":
+            hash1 |= 0x80000000
+
+        # Hashes are restricted to 32 bits
+        uint_mask = 0xFFFFFFFF
+        hash2 = 0
+        for char in chars[1:-2]:
+            hash2 = (hash2 * 0x1003F + char) & uint_mask
+
+        hash3 = 0
+        for char in map(ord, ext):
+            hash3 = (hash3 * 0x1003F + char) & uint_mask
+
+        hash2 = (hash2 + hash3) & uint_mask
+
+        return (hash2 << 32) + (hash1 & uint_mask)
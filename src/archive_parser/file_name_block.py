@@ -5,7 +5,7 @@ Copyright (c) Cutleast
 from dataclasses import dataclass
 from io import BufferedReader
 
-from .datatypes import Float, Hash, Integer, String
+from .datatypes import Float, Hash, Integer
 
 
 @dataclass
@@ -16,7 +16,9 @@ class FileNameBlock:
 
     data_stream: BufferedReader
 
-    def parse(self, count: int):
-        self.file_names = String.list(self.data_stream, count)
+    def parse(self, count: int, total_length: int):
+        # Names are read at once and split at the null terminators
+        names = self.data_stream.read(total_length).split(b"\x00", count)
+        self.file_names = [name.decode() for name in names[:count]]
 
         return self
\ No newline at end of file
@@ -2,6 +2,7 @@
 Copyright (c) Cutleast
 """
 
+import struct
 from dataclasses import dataclass
 from io import BufferedReader
 
@@ -17,13 +18,10 @@ class FileRecordBlock:
     data_stream: BufferedReader
 
     def parse(self, count: int):
-        self.name_length = Integer.int8(self.data_stream)
+        self.name_length = Integer.uint8(self.data_stream)
         self.name = self.data_stream.read(self.name_length)
         # self.name = String.bzstring(self.data_stream)
-        self.file_records = [
-            FileRecord(self.data_stream).parse()
-            for i in range(count)
-        ]
+        self.file_records = FileRecord.parse_block(self.data_stream, count)
 
         return self
 
@@ -37,6 +35,25 @@ class FileRecord:
     data_stream: BufferedReader
     compressed = None
 
+    # Name hash, size, offset
+    STRUCT = struct.Struct("<QII")
+
+    @classmethod
+    def parse_block(cls, data_stream: BufferedReader, count: int):
+        """
+        Reads <count> file records at once and returns them.
+        """
+
+        data = data_stream.read(cls.STRUCT.size * count)
+
+        file_records: list[FileRecord] = []
+        for values in cls.STRUCT.iter_unpack(data):
+            file_record = cls(data_stream)
+            file_record.name_hash, file_record.size, file_record.offset = values
+            file_records.append(file_record)
+
+        return file_records
+
     def has_compression_flag(self):
         # Mask for the 30th bit (0x40000000)
         mask = 0x40000000
@@ -2,6 +2,7 @@
 Copyright (c) Cutleast
 """
 
+import struct
 from dataclasses import dataclass
 from io import BufferedReader
 
@@ -16,6 +17,48 @@ class FolderRecord:
 
     data_stream: BufferedReader
 
+    # Name hash, file count, padding, offset, padding
+    STRUCT = struct.Struct("<QIIII")
+
+    # Name hash, file count, offset (v103 and v104)
+    STRUCT_LEGACY = struct.Struct("<QII")
+
+    padding: int = 0
+    padding2: int = 0
+
+    @classmethod
+    def parse_block(cls, data_stream: BufferedReader, count: int, version: int = 105):
+        """
+        Reads <count> folder records of archive <version> at once
+        and returns them.
+        """
+
+        if version >= 105:
+            layout = cls.STRUCT
+        else:
+            layout = cls.STRUCT_LEGACY
+
+        data = data_stream.read(layout.size * count)
+
+        folders: list[FolderRecord] = []
+        for values in layout.iter_unpack(data):
+            folder = cls(data_stream)
+
+            if version >= 105:
+                (
+                    folder.name_hash,
+                    folder.count,
+                    folder.padding,
+                    folder.offset,
+                    folder.padding2,
+                ) = values
+            else:
+                folder.name_hash, folder.count, folder.offset = values
+
+            folders.append(folder)
+
+        return folders
+
     def parse(self):
         self.name_hash = Hash.hash(self.data_stream)
         self.count = Integer.ulong(self.data_stream)
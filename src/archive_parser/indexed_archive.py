@@ -0,0 +1,62 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .compression import Compression
+from .utilities import normalize_path
+
+
+@dataclass
+class IndexedArchive:
+    """
+    Compact file table of a parsed archive.
+    """
+
+    archive_path: Path
+
+    # File names are stored in front of the file data
+    embed_file_names: bool = False
+
+    # Decompressed size is stored in front of compressed file data
+    size_prefix: bool = False
+
+    # Full file path (folder\file) -> (offset, size, compression, original size)
+    files: dict[str, tuple[int, int, Compression, int]] = field(default_factory=dict)
+
+    # Extension -> full file paths, built on first use
+    _extensions: dict[str, list[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def extensions(self):
+        """
+        Maps file extensions (eg. ".pex") to the paths of the files.
+        """
+
+        if self._extensions is None:
+            extensions: dict[str, list[str]] = {}
+
+            for file_path in self.files:
+                extension = os.path.splitext(file_path)[1]
+                extensions.setdefault(extension, []).append(file_path)
+
+            self._extensions = extensions
+
+        return self._extensions
+
+    def get_file(self, path: str):
+        """
+        Returns (offset, size, compression, original size) of file at <path>.
+        """
+
+        file = self.files.get(normalize_path(path))
+
+        if file is None:
+            raise FileNotFoundError("File is not in archive!")
+
+        return file
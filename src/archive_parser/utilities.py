@@ -2,7 +2,8 @@
 Copyright (c) Cutleast
 """
 
-
+import re
+from fnmatch import translate
 from io import BufferedReader
 
 
@@ -16,3 +17,21 @@ def peek(stream: BufferedReader, length: int):
     stream.seek(-length, 1)
 
     return data
+
+
+def normalize_path(path: str):
+    """
+    Normalizes <path> to the lower case, backslash separated
+    form that is used for files in archives.
+    """
+
+    return path.replace("/", "\\").lower()
+
+
+def compile_glob(pattern: str):
+    """
+    Compiles glob <pattern> to a case-insensitive regex
+    that is matched against normalized paths.
+    """
+
+    return re.compile(translate(normalize_path(pattern)), re.IGNORECASE)
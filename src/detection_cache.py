@@ -0,0 +1,202 @@
+"""
+This file is part of SEE Lang Detector
+and falls under the license
+GNU General Public License v3.0.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from lingua import Language
+
+
+class DetectionCache:
+    """
+    Class to manage cached language detection results.
+
+    Results are keyed by the hash of the string, the detected
+    language pair and the detector confidence. The cache is
+    kept in memory as LRU with a size cap and persisted to JSON.
+    """
+
+    cache_path = Path("./assets/detection_cache.json").resolve()
+
+    # Maximum number of cached strings
+    max_size: int = 200_000
+
+    # Returned for strings that are not in the cache
+    MISSING = object()
+
+    # Whether new entries are collected for `pop_new_entries`
+    track_new_entries: bool = False
+
+    def __init__(self, max_size: int = None, load: bool = True):
+        if max_size is not None:
+            self.max_size = max_size
+
+        self._entries: OrderedDict[tuple[str, str], Language | None] = OrderedDict()
+        self._new_entries: list[tuple[str, str, str | None]] = []
+        self._lock = threading.Lock()
+        self._changed = False
+
+        # Caches of worker processes are filled by the main process
+        if load:
+            self.load_cache()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def get_scope(
+        langs: list[Language], confidence: float, cascade_margin: float = None
+    ):
+        """
+        Returns cache scope for <langs>, <confidence> and <cascade_margin>.
+        """
+
+        lang_names = ",".join(sorted(lang.name for lang in langs))
+
+        if cascade_margin is None:
+            return f"{lang_names}|{confidence}"
+
+        return f"{lang_names}|{confidence}|{cascade_margin}"
+
+    @staticmethod
+    def get_hash(string: str):
+        """
+        Returns hash of <string> that is used as cache key.
+        """
+
+        return hashlib.blake2b(string.encode("utf8"), digest_size=12).hexdigest()
+
+    def get_many(self, strings: list[str], scope: str):
+        """
+        Returns cached languages of <strings> in <scope>.
+        Strings that are not cached are returned as `MISSING`.
+        """
+
+        keys = [(self.get_hash(string), scope) for string in strings]
+        result: list[Language | None | object] = []
+
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    result.append(self._entries[key])
+                else:
+                    result.append(self.MISSING)
+
+        return result
+
+    def set_many(self, strings: list[str], langs: list[Language | None], scope: str):
+        """
+        Caches <langs> for <strings> in <scope>.
+        """
+
+        keys = [(self.get_hash(string), scope) for string in strings]
+
+        with self._lock:
+            for key, lang in zip(keys, langs):
+                self._entries[key] = lang
+                self._entries.move_to_end(key)
+
+                if self.track_new_entries:
+                    self._new_entries.append(
+                        (*key, lang.name if lang is not None else None)
+                    )
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+            self._changed = True
+
+    def pop_new_entries(self):
+        """
+        Returns and clears entries that were added since last call
+        as picklable (hash, scope, language name) tuples.
+        """
+
+        with self._lock:
+            new_entries = self._new_entries
+            self._new_entries = []
+
+        return new_entries
+
+    def get_entries(self, scope: str):
+        """
+        Returns entries in <scope> as picklable
+        (hash, scope, language name) tuples for `add_entries`.
+        """
+
+        with self._lock:
+            return [
+                (string_hash, entry_scope, lang.name if lang is not None else None)
+                for (string_hash, entry_scope), lang in self._entries.items()
+                if entry_scope == scope
+            ]
+
+    def add_entries(self, entries: list[tuple[str, str, str | None]]):
+        """
+        Adds <entries> returned by `pop_new_entries` of another cache.
+        """
+
+        with self._lock:
+            for string_hash, scope, lang_name in entries:
+                key = (string_hash, scope)
+                self._entries[key] = (
+                    getattr(Language, lang_name) if lang_name is not None else None
+                )
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+            if entries:
+                self._changed = True
+
+    def save_cache(self):
+        """
+        Saves cache to JSON file if it changed.
+        """
+
+        if not self._changed:
+            return
+
+        scopes: dict[str, list[tuple[str, str | None]]] = {}
+
+        # Entries are saved from least to most recently used
+        with self._lock:
+            for (string_hash, scope), lang in self._entries.items():
+                scopes.setdefault(scope, []).append(
+                    (string_hash, lang.name if lang is not None else None)
+                )
+
+            self._changed = False
+
+        with open(self.cache_path, "w", encoding="utf8") as file:
+            json.dump(scopes, file)
+
+    def load_cache(self):
+        """
+        Loads cache from JSON file.
+        """
+
+        if not self.cache_path.is_file():
+            return
+
+        try:
+            with open(self.cache_path, "r", encoding="utf8") as file:
+                scopes: dict[str, list[list[str | None]]] = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        for scope, entries in scopes.items():
+            for string_hash, lang_name in entries:
+                lang = getattr(Language, lang_name) if lang_name is not None else None
+                self._entries[(string_hash, scope)] = lang
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
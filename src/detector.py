@@ -5,8 +5,22 @@ GNU General Public License v3.0.
 """
 
 import logging
-
-import qtpy.QtCore as qtc
+import math
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable
+
+from detection_cache import DetectionCache
+from dictionary import Dictionary
+from progress_tracker import FileProgress
+from unicode_scripts import (
+    get_dominant_script,
+    get_language_scripts,
+    strip_placeholders,
+)
 
 print("Importing lingua...")
 from lingua import Language, LanguageDetector, LanguageDetectorBuilder
@@ -18,6 +32,48 @@ with open("./assets/confidence.txt", "r") as file:
 print("Detector confidence:", CONFIDENCE)
 
 
+@dataclass
+class TriageResult:
+    """
+    Result of a triage scan of a file.
+    """
+
+    # Whether the file is considered untranslated
+    untranslated: bool
+
+    # Number of strings that are not in the dictionary
+    total: int
+
+    # Number of strings that were detected before the test stopped
+    sampled: int
+
+    # Untranslated strings among the sampled strings
+    untranslated_strings: list[dict[str, str]] = field(default_factory=list)
+
+    # Wilson score interval of the untranslated ratio
+    lower_bound: float = 0.0
+    upper_bound: float = 1.0
+
+    @property
+    def ratio(self):
+        """
+        Estimated ratio of untranslated strings.
+        """
+
+        if not self.sampled:
+            return 0.0
+
+        return len(self.untranslated_strings) / self.sampled
+
+    @property
+    def exhaustive(self):
+        """
+        Whether all strings were sampled and the ratio is exact.
+        """
+
+        return self.sampled == self.total
+
+
 class LangDetector:
     """
     Language detector class.
@@ -25,13 +81,87 @@ class LangDetector:
 
     langs: list[Language] = []
     detector: LanguageDetector = None
+    low_accuracy_detector: LanguageDetector = None
+    dictionary: Dictionary = None
+    cache: DetectionCache = None
+    cache_scope: str = None
+
+    # Languages of <langs> by the scripts they are written in
+    script_langs: dict[str, list[Language]] = None
+    use_scripts: bool = False
+
+    # Share of letters that must be in one script to classify a string by it
+    script_coverage: float = 0.9
+
+    # Returned by `pre_classify` for strings that have to be passed to lingua
+    UNDECIDED = object()
+
+    # Strings are detected with a low accuracy detector first and only
+    # passed to the high accuracy detector if the confidence margin between
+    # the two most likely languages is below this bound, None disables this.
+    # Low accuracy mode is unreliable on short strings, so the cascade is
+    # disabled by default and the margin should be validated with the
+    # mismatch rate that is reported in the tier statistics
+    cascade_margin: float = None
+
+    # Strings shorter than this are always passed to the high accuracy detector
+    cascade_min_length: int = 120
+
+    # Share of strings accepted by the low accuracy detector that are
+    # detected with the high accuracy detector as well to measure mismatches.
+    # The verdicts of the low accuracy detector are kept for these strings
+    cascade_audit_rate: float = 0.02
+
+    # Number of strings decided by each tier of the detection
+    TIERS = ["script", "cache", "low accuracy", "high accuracy"]
+    tier_hits: Counter = None
+
+    # Lingua detectors shared by all threads,
+    # keyed by languages, confidence and low accuracy mode
+    _detectors: dict[tuple[frozenset[Language], float, bool], LanguageDetector] = {}
+    _detectors_lock = threading.Lock()
+
+    # Number of strings that are passed to lingua at once
+    chunk_size: int = 1000
+
+    # Sequential probability ratio test of triage scans:
+    # files with an untranslated ratio of at most <triage_p0> are translated,
+    # files with a ratio of at least <triage_p1> are untranslated
+    triage_p0: float = 0.02
+    triage_p1: float = 0.1
+    triage_alpha: float = 0.05
+    triage_beta: float = 0.05
+    triage_chunk_size: int = 25
+
+    def __init__(
+        self,
+        app=None,
+        chunk_size: int = None,
+        dictionary: Dictionary = None,
+        cache: DetectionCache = None,
+    ):
+        """
+        <app> may be None if <dictionary> and <cache> are given,
+        for eg. in worker processes.
+        """
 
-    def __init__(self, app):
         self.app = app
 
+        if chunk_size is not None:
+            self.chunk_size = max(1, chunk_size)
+
+        self.dictionary = dictionary if dictionary is not None else self.app.dict
+        self.cache = cache if cache is not None else self.app.detection_cache
+
+        self.tier_hits = Counter()
+        self._audit_rng = random.Random()
+
+        # All detectors share the same logger, so the handler is only added once
         self.log = logging.getLogger(self.__repr__())
-        self.log.addHandler(self.app.log_str)
-        self.log.setLevel(self.app.log.level)
+        if self.app is not None:
+            if self.app.log_handler not in self.log.handlers:
+                self.log.addHandler(self.app.log_handler)
+            self.log.setLevel(self.app.log.level)
 
     def __repr__(self):
         return "LangDetector"
@@ -49,59 +179,161 @@ class LangDetector:
 
     def set_langs(self, langs: list[Language]):
         """
-        Sets <langs> and builds language detector.
+        Sets <langs> and gets shared language detector.
         """
 
         self.langs = langs
-        self.detector = (
-            LanguageDetectorBuilder.from_languages(*self.langs)
-            .with_minimum_relative_distance(CONFIDENCE)
-            .build()
+        self.cache_scope = DetectionCache.get_scope(
+            self.langs, CONFIDENCE, self.cascade_margin
         )
+        self.detector = self.get_detector(self.langs)
+
+        if self.cascade_margin is not None:
+            self.low_accuracy_detector = self.get_detector(
+                self.langs, low_accuracy=True
+            )
+        else:
+            self.low_accuracy_detector = None
+
+        self.script_langs = {}
+        for lang in self.langs:
+            for script in get_language_scripts(lang.name):
+                self.script_langs.setdefault(script, []).append(lang)
+
+        # Scripts only help if one of them is unique to a language
+        self.use_scripts = any(len(langs) == 1 for langs in self.script_langs.values())
+
+    @classmethod
+    def get_detector(
+        cls,
+        langs: list[Language],
+        confidence: float = CONFIDENCE,
+        low_accuracy: bool = False,
+    ):
+        """
+        Returns shared language detector for <langs> and <confidence>.
+        The detector is built once on first request and reused afterwards.
+
+        Detectors in <low_accuracy> mode are meant for confidence values
+        and have no minimum relative distance.
+        """
+
+        key = (frozenset(langs), confidence, low_accuracy)
+
+        with cls._detectors_lock:
+            if key not in cls._detectors:
+                builder = LanguageDetectorBuilder.from_languages(*langs)
+
+                if low_accuracy:
+                    builder = builder.with_low_accuracy_mode()
+                else:
+                    builder = builder.with_minimum_relative_distance(confidence)
+
+                cls._detectors[key] = builder.with_preloaded_language_models().build()
+
+            return cls._detectors[key]
+
+    def pop_tier_hits(self):
+        """
+        Returns and resets number of strings decided by each tier.
+        """
+
+        tier_hits = self.tier_hits
+        self.tier_hits = Counter()
+
+        return tier_hits
+
+    @classmethod
+    def format_tier_hits(cls, tier_hits: Counter):
+        """
+        Returns <tier_hits> as readable text with the share of each tier.
+        """
+
+        total = sum(tier_hits[tier] for tier in cls.TIERS)
+        if not total:
+            return "No strings detected."
+
+        text = ", ".join(
+            f"{tier}: {tier_hits[tier]} ({tier_hits[tier] / total:.1%})"
+            for tier in cls.TIERS
+        )
+
+        if audited := tier_hits["audited"]:
+            text += (
+                f"; low accuracy mismatches: {tier_hits['mismatches']}/{audited}"
+                f" ({tier_hits['mismatches'] / audited:.1%}) of audited strings"
+            )
+
+        return text
 
     def clean_target_lang_strings(
         self,
-        strings: list[dict[str, str]],
+        strings: Iterable[dict[str, str]],
         target_lang: Language,
-        progress_sign: qtc.Signal = None,
-        status_sign: qtc.Signal = None,
+        progress: FileProgress = None,
     ):
         """
         Cleans and returns all strings from <strings>
         that are in the <target_lang>.
+
+        <strings> may also be an iterator that is consumed lazily
+        in chunks. The progress is indeterminate in that case.
+
+        The number of processed strings is reported to <progress>
+        once per chunk.
         """
 
         output: list[dict[str, str]] = []
 
-        if progress_sign:
-            progress_sign.emit((0, len(strings), 0))
+        if isinstance(strings, list):
+            strings = list(self.skip_dictionary_strings(strings))
+            total = len(strings)
+        else:
+            strings = self.skip_dictionary_strings(strings)
+            total = 0
 
-        for c, string in enumerate(strings):
-            if (  # Skip string if in dictionary
-                string["editor_id"] in self.app.dict.edids
-                or string["string"] in self.app.dict.strings
-            ):
-                continue
+        if progress:
+            progress.set_progress(0, total)
+            progress.set_status("Processing string", counting=True)
 
-            if progress_sign:
-                progress_sign.emit((0, len(strings), c))
-            if status_sign:
-                status_sign.emit(f"Processing string {c}/{len(strings)}...")
-            else:
-                self.log.debug(f"Processing string {c}/{len(strings)}...")
+        strings = iter(strings)
+        c = 0
+        while chunk := list(islice(strings, self.chunk_size)):
+            if progress:
+                progress.set_progress(c)
+            elif self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug(f"Processing string {c}/{total or '?'}...")
+
+            langs = self.detect_langs([string["string"] for string in chunk])
+
+            output += [
+                string
+                for string, lang in zip(chunk, langs)
+                if lang != target_lang and lang is not None
+            ]
 
-            if (
-                lang := self.detect_lang(string["string"])
-            ) != target_lang and lang is not None:
-                output.append(string)
+            c += len(chunk)
 
-        if not status_sign:
+        if not progress:
             self.log.debug(
                 f"Found {len(output)} string(s) that are not in {target_lang}."
             )
 
         return output
 
+    def skip_dictionary_strings(self, strings: Iterable[dict[str, str]]):
+        """
+        Yields strings from <strings> whose EDID or string
+        is not in the dictionary.
+        """
+
+        for string in strings:
+            if not (
+                self.dictionary.has_edid(string["editor_id"])
+                or self.dictionary.has_string(string["string"])
+            ):
+                yield string
+
     def has_untranslated_strings(
         self, strings: list[dict[str, str]], target_lang: Language, treshold: int = 10
     ):
@@ -113,26 +345,310 @@ class LangDetector:
 
         number_of_untranslated_strings = 0
 
-        for string in strings:
-            if (  # Skip string if in dictionary
-                string["editor_id"] in self.app.dict.edids
-                or string["string"] in self.app.dict.strings
-            ):
-                continue
+        strings = list(self.skip_dictionary_strings(strings))
+
+        # Detect in smaller chunks to be able to stop early
+        chunk_size = max(treshold, min(self.chunk_size, 100))
+
+        for c in range(0, len(strings), chunk_size):
+            chunk = strings[c : c + chunk_size]
+            langs = self.detect_langs([string["string"] for string in chunk])
 
-            if self.detect_lang(string["string"]) != target_lang:
-                number_of_untranslated_strings += 1
+            for lang in langs:
+                if lang != target_lang:
+                    number_of_untranslated_strings += 1
 
-            if number_of_untranslated_strings >= treshold:
-                return True
+                if number_of_untranslated_strings >= treshold:
+                    return True
 
         return False
 
+    @staticmethod
+    def get_sample_order(strings: list[dict[str, str]], rng: random.Random):
+        """
+        Returns <strings> in random order stratified by their type.
+
+        Strings of each type are shuffled and spread evenly over the
+        result, so that every prefix contains all types in proportion.
+        """
+
+        strata: dict[str, list[dict[str, str]]] = {}
+        for string in strings:
+            strata.setdefault(string.get("type", ""), []).append(string)
+
+        keyed: list[tuple[float, dict[str, str]]] = []
+        for stratum in strata.values():
+            rng.shuffle(stratum)
+            size = len(stratum)
+            keyed += [
+                ((i + rng.random()) / size, string) for i, string in enumerate(stratum)
+            ]
+
+        keyed.sort(key=lambda item: item[0])
+
+        return [string for _, string in keyed]
+
+    @staticmethod
+    def get_wilson_interval(successes: int, trials: int, z: float = 1.96):
+        """
+        Returns lower and upper Wilson score bound of the ratio
+        <successes>/<trials> for the confidence given by <z>.
+        """
+
+        if not trials:
+            return 0.0, 1.0
+
+        ratio = successes / trials
+        denominator = 1 + z**2 / trials
+        center = (ratio + z**2 / (2 * trials)) / denominator
+        margin = (
+            z
+            * math.sqrt(ratio * (1 - ratio) / trials + z**2 / (4 * trials**2))
+            / denominator
+        )
+
+        return max(0.0, center - margin), min(1.0, center + margin)
+
+    def triage(
+        self,
+        strings: list[dict[str, str]],
+        target_lang: Language,
+        progress: FileProgress = None,
+        seed: int = None,
+    ):
+        """
+        Samples <strings> in random, type-stratified order until a
+        sequential probability ratio test decides whether the file
+        is translated to <target_lang> or not.
+
+        If all strings are sampled without a decision, the file is
+        untranslated if any of them is not in <target_lang>,
+        like in a full scan.
+
+        Returns a TriageResult.
+        """
+
+        strings = self.get_sample_order(
+            list(self.skip_dictionary_strings(strings)), random.Random(seed)
+        )
+        total = len(strings)
+
+        # Log-likelihood ratio steps and decision bounds
+        hit_step = math.log(self.triage_p1 / self.triage_p0)
+        miss_step = math.log((1 - self.triage_p1) / (1 - self.triage_p0))
+        upper_limit = math.log((1 - self.triage_beta) / self.triage_alpha)
+        lower_limit = math.log(self.triage_beta / (1 - self.triage_alpha))
+
+        untranslated_strings: list[dict[str, str]] = []
+        llr = 0.0
+        sampled = 0
+        verdict: bool = None
+
+        while verdict is None and sampled < total:
+            if progress:
+                progress.set_progress(sampled, total)
+
+            chunk = strings[sampled : sampled + self.triage_chunk_size]
+            langs = self.detect_langs([string["string"] for string in chunk])
+
+            for string, lang in zip(chunk, langs):
+                sampled += 1
+
+                if lang != target_lang and lang is not None:
+                    untranslated_strings.append(string)
+                    llr += hit_step
+                else:
+                    llr += miss_step
+
+                if llr >= upper_limit:
+                    verdict = True
+                    break
+                elif llr <= lower_limit:
+                    verdict = False
+                    break
+
+        if verdict is None:
+            verdict = bool(untranslated_strings)
+
+        lower_bound, upper_bound = self.get_wilson_interval(
+            len(untranslated_strings), sampled
+        )
+
+        result = TriageResult(
+            verdict,
+            total,
+            sampled,
+            untranslated_strings,
+            lower_bound,
+            upper_bound,
+        )
+
+        self.log.debug(
+            f"Triage stopped after {sampled}/{total} string(s): "
+            f"{'untranslated' if verdict else 'translated'}, "
+            f"ratio {result.ratio:.1%} ({lower_bound:.1%} - {upper_bound:.1%})."
+        )
+
+        return result
+
     def detect_lang(self, string: str):
         """
         Detects language of <string> and returns it.
         """
 
-        lang = self.detector.detect_language_of(string)
+        lang = self.detect_langs([string])[0]
 
         return lang
+
+    def pre_classify(self, string: str):
+        """
+        Classifies <string> without lingua where this is possible.
+
+        Returns None for strings without any letters, like numbers,
+        punctuation or format placeholders, and the language for
+        strings whose letters are almost all in a script that only
+        one of <langs> is written in.
+        Returns `UNDECIDED` for all other strings.
+        """
+
+        script, coverage = get_dominant_script(strip_placeholders(string))
+
+        if script is None:
+            return None
+
+        if self.use_scripts and coverage >= self.script_coverage:
+            langs = self.script_langs.get(script, [])
+
+            if len(langs) == 1:
+                return langs[0]
+
+        return self.UNDECIDED
+
+    def detect_langs(self, strings: list[str]):
+        """
+        Detects languages of <strings> in one batch and returns them
+        in the same order.
+
+        Strings that can be classified by their characters alone
+        are not passed to lingua.
+        """
+
+        langs = [self.pre_classify(string) for string in strings]
+
+        undecided_strings = [
+            string for string, lang in zip(strings, langs) if lang is self.UNDECIDED
+        ]
+        self.tier_hits["script"] += len(strings) - len(undecided_strings)
+
+        if undecided_strings:
+            detected_langs = iter(self.detect_langs_with_lingua(undecided_strings))
+            langs = [
+                next(detected_langs) if lang is self.UNDECIDED else lang
+                for lang in langs
+            ]
+
+        return langs
+
+    def detect_langs_with_lingua(self, strings: list[str]):
+        """
+        Detects languages of <strings> with lingua and returns them
+        in the same order.
+
+        Strings that are already in the detection cache
+        are not passed to lingua.
+        """
+
+        langs = self.cache.get_many(strings, self.cache_scope)
+
+        # Deduplicate strings that are not cached yet
+        missing_strings = list(
+            dict.fromkeys(
+                string
+                for string, lang in zip(strings, langs)
+                if lang is DetectionCache.MISSING
+            )
+        )
+
+        self.tier_hits["cache"] += sum(
+            lang is not DetectionCache.MISSING for lang in langs
+        )
+
+        if missing_strings:
+            detected_langs = self.detect_langs_in_cascade(missing_strings)
+            self.cache.set_many(missing_strings, detected_langs, self.cache_scope)
+
+            detected = dict(zip(missing_strings, detected_langs))
+            langs = [
+                detected[string] if lang is DetectionCache.MISSING else lang
+                for string, lang in zip(strings, langs)
+            ]
+
+        return langs
+
+    def detect_langs_in_cascade(self, strings: list[str]):
+        """
+        Detects languages of <strings> with the low accuracy detector and
+        passes strings that are shorter than <cascade_min_length> or whose
+        confidence margin is below <cascade_margin> to the high accuracy
+        detector.
+
+        A random share of <cascade_audit_rate> of the strings accepted by
+        the low accuracy detector is detected with both to count mismatches.
+        """
+
+        if self.low_accuracy_detector is None:
+            self.tier_hits["high accuracy"] += len(strings)
+            return self.detector.detect_languages_in_parallel_of(strings)
+
+        langs: list[Language] = [None] * len(strings)
+        escalated: list[int] = []
+        audited: list[int] = []
+
+        candidates: list[int] = []
+        for i, string in enumerate(strings):
+            if len(string) >= self.cascade_min_length:
+                candidates.append(i)
+            else:
+                escalated.append(i)
+
+        detector = self.low_accuracy_detector
+        confidence_values = detector.compute_language_confidence_values_in_parallel(
+            [strings[i] for i in candidates]
+        )
+
+        for i, values in zip(candidates, confidence_values):
+            # Confidence values are sorted in descending order
+            if len(values) > 1:
+                margin = values[0].value - values[1].value
+            elif values:
+                margin = values[0].value
+            else:
+                margin = 0.0
+
+            if values and values[0].value > 0 and margin >= self.cascade_margin:
+                langs[i] = values[0].language
+
+                if self._audit_rng.random() < self.cascade_audit_rate:
+                    audited.append(i)
+            else:
+                escalated.append(i)
+
+        if escalated or audited:
+            indices = escalated + audited
+            high_accuracy_langs = self.detector.detect_languages_in_parallel_of(
+                [strings[i] for i in indices]
+            )
+
+            for i, lang in zip(escalated, high_accuracy_langs):
+                langs[i] = lang
+
+            # Audits only count mismatches, so results don't depend on them
+            for i, lang in zip(audited, high_accuracy_langs[len(escalated) :]):
+                if langs[i] != lang:
+                    self.tier_hits["mismatches"] += 1
+
+        self.tier_hits["low accuracy"] += len(strings) - len(escalated)
+        self.tier_hits["high accuracy"] += len(escalated)
+        self.tier_hits["audited"] += len(audited)
+
+        return langs
@@ -12,14 +12,27 @@ import json
 class Dictionary:
     """
     Class to manage saved strings and EDIDs.
+
+    EDIDs and strings are kept as lists to preserve their order
+    when saving and as sets for fast membership checks.
     """
 
     dict_path = Path("./assets/dictionary.json").resolve()
-    edids: list[str] = []
-    strings: list[str] = []
+    edids: list[str] = None
+    strings: list[str] = None
+
+    # Incremented whenever an EDID or string is added
+    revision: int = 0
+
+    def __init__(self, load: bool = True):
+        self.edids = []
+        self.strings = []
+        self._edid_index: set[str] = set()
+        self._string_index: set[str] = set()
 
-    def __init__(self):
-        self.load_dictonary()
+        # Dictionaries of worker processes are filled by the main process
+        if load:
+            self.load_dictonary()
 
     def save_dictionary(self):
         """
@@ -28,6 +41,7 @@ class Dictionary:
 
         with open(self.dict_path, "w", encoding="utf8") as file:
             json.dump({
+                "revision": self.revision,
                 "edids": self.edids,
                 "strings": self.strings
             }, file, indent=4, ensure_ascii=False)
@@ -42,22 +56,52 @@ class Dictionary:
 
         with open(self.dict_path, "r", encoding="utf8") as file:
             data = json.load(file)
-            self.edids = data["edids"]
-            self.strings = data["strings"]
+
+        self.add_many(data["edids"], data["strings"])
+        self.revision = data.get("revision", 0)
+
+    def has_edid(self, edid: str):
+        """
+        Checks if <edid> is in the dictionary.
+        """
+
+        return edid in self._edid_index
+
+    def has_string(self, string: str):
+        """
+        Checks if <string> is in the dictionary.
+        """
+
+        return string in self._string_index
 
     def add_edid(self, edid: str):
         """
         Adds <edid> to the list of EDIDs.
         """
 
-        if edid not in self.edids:
+        if edid not in self._edid_index:
+            self._edid_index.add(edid)
             self.edids.append(edid)
+            self.revision += 1
 
     def add_string(self, string: str):
         """
         Adds <string> to the list of strings.
         """
 
-        if string not in self.strings:
+        if string not in self._string_index:
+            self._string_index.add(string)
             self.strings.append(string)
+            self.revision += 1
+
+    def add_many(self, edids: list[str] = None, strings: list[str] = None):
+        """
+        Adds <edids> and <strings> to the dictionary.
+        """
+
+        for edid in edids or []:
+            self.add_edid(edid)
+
+        for string in strings or []:
+            self.add_string(string)
 
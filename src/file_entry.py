@@ -15,6 +15,7 @@ import qtpy.QtCore as qtc
 import qtpy.QtGui as qtg
 import qtpy.QtWidgets as qtw
 
+from archive_parser.archive_member import ArchiveMember
 from string_preview import StringPreview
 
 
@@ -30,17 +31,31 @@ class FileEntry(qtc.QObject):
     progress_error_sign = qtc.Signal()
     file_path: Path = None
     strings: list[dict[str, str]] = None
+    string_count: int = None
     untranslated_strings: list[dict[str, str]] = None
     enable_preview_btn_sign = qtc.Signal()
     set_visible_sign = qtc.Signal(bool)
     bsa: bool = False
+    archive_member: ArchiveMember = None
+
+    # Result of last triage scan, None if not triaged yet
+    triage_result = None
+
+    # Prefetched content of file in archive
+    content: bytes = None
     display_name: str = None
 
-    def __init__(self, app, file: Path):
+    def __init__(self, app, file: Path, archive_member: ArchiveMember = None):
         super().__init__()
 
         self.app = app
         self.file_path = file
+
+        # File is read directly from archive
+        if archive_member is not None:
+            self.archive_member = archive_member
+            self.file_path = archive_member.path
+            self.bsa = True
     
     def __repr__(self) -> str:
         return str(self.display_name)
@@ -85,10 +100,10 @@ class FileEntry(qtc.QObject):
         self.num_label.setText("Unknown")
 
         def update_num(num: str):
-            if self.strings:
+            if self.string_count:
                 self.progress_widget.progress_bar.setObjectName("finished_statistic")
                 self.progress_widget.progress_bar.setStyleSheet(self.app.styleSheet())
-                self.progress_widget.progress_bar.setRange(0, len(self.strings))
+                self.progress_widget.progress_bar.setRange(0, self.string_count)
                 self.progress_widget.progress_bar.setValue(len(self.untranslated_strings))
             else:
                 self.progress_widget.progress_bar.setRange(0, 1)
@@ -106,12 +121,42 @@ class FileEntry(qtc.QObject):
             # del self.num_label
         # del self
     
+    @property
+    def source_path(self):
+        """
+        Path of the file on disk, the archive for files in archives.
+        """
+
+        if self.archive_member is not None:
+            return self.archive_member.archive_path
+
+        return self.file_path
+
+    def read_bytes(self):
+        """
+        Reads and returns content of file.
+        """
+
+        if self.content is not None:
+            return self.content
+
+        if self.archive_member is not None:
+            return self.archive_member.read()
+
+        return self.file_path.read_bytes()
+
     def open_file(self):
         """
         Opens file with standard application.
         """
 
-        if self.file_path.is_file():
+        # Files in archives are only extracted when opened
+        if self.archive_member is not None:
+            file_path = Path("temp").resolve() / self.file_path.name
+            os.makedirs(file_path.parent, exist_ok=True)
+            file_path.write_bytes(self.read_bytes())
+            os.startfile(file_path)
+        elif self.file_path.is_file():
             os.startfile(self.file_path)
         else:
             qtw.QMessageBox.critical(
@@ -127,6 +172,14 @@ class FileEntry(qtc.QObject):
 
         raise NotImplementedError
 
+    def iter_strings(self):
+        """
+        Extracts strings while they are consumed.
+        `strings` is complete when the iterator is exhausted.
+        """
+
+        yield from self.extract_strings()
+
     def preview_strings(self):
         """
         Opens preview dialog with strings.
@@ -9,12 +9,17 @@ Qt Version: 6.5.2
 
 import json
 import logging
+import multiprocessing
 import os
 import shutil
 import sys
+import threading
 import time
 import traceback
 import winreg
+from logging.handlers import QueueListener, RotatingFileHandler
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from winsound import MessageBeep as alert
 from pathlib import Path
 from queue import Empty, Queue
@@ -27,9 +32,14 @@ import qtpy.QtCore as qtc
 import qtpy.QtGui as qtg
 import qtpy.QtWidgets as qtw
 
+import scan_worker
 import utilities as utils
-from archive_parser.archive_parser import ArchiveParser
-from detector import LangDetector, Language
+from archive_parser.archive_cache import ArchiveCache
+from archive_parser.archive_member import ArchiveMember
+from archive_parser.archive_index import ArchiveIndex
+from archive_parser.bulk_reader import BulkReader
+from detection_cache import DetectionCache
+from detector import CONFIDENCE, LangDetector, Language, TriageResult
 from dictionary import Dictionary
 from error_dialog import ErrorDialog
 from file_entry import FileEntry
@@ -38,6 +48,8 @@ from loading_dialog import LoadingDialog
 from mcm_file import MCMEntry
 from plugin import PluginEntry
 from plugin_loader import PluginLoader
+from progress_tracker import ProgressTracker
+from scan_index import ScanIndex
 from script_entry import ScriptEntry
 
 
@@ -51,14 +63,18 @@ class MainApp(qtw.QApplication):
 
     queue: Queue = None
     done_signal = qtc.Signal()
-    incr_progress_sign = qtc.Signal()
-    incr_untranslated_sign = qtc.Signal()
+    progress_tracker: ProgressTracker = None
     num_threads: int = None
+    scan_mode: str = None
+    SCAN_MODES = ["Threads", "Processes"]
+    run_mode: str = None
+    RUN_MODES = ["Full", "Triage", "Full (flagged only)"]
     original_lang: Language = None
     desired_lang: Language = None
     threads: list[utils.Thread] = []
     all_files: list[FileEntry] = []
     relevant_files: list[FileEntry] = []
+    scan_files: list[FileEntry] = []
     untranslated_num: int = 0
     prev_search: str = ""
     file_list_table: FileListTable = None
@@ -68,6 +84,16 @@ class MainApp(qtw.QApplication):
     include_bsas: bool = None
     start_time: int = None
     hide_translated: bool = False
+    incremental_scan: bool = None
+    scan_context: str = None
+    detection_chunk_size: int = LangDetector.chunk_size
+    script_backend: str = ScriptEntry.backend
+    archive_batch_size: int = 100
+    cascade_margin: float = LangDetector.cascade_margin
+    debug_logging: bool = True
+    log_file: bool = False
+    log_listener: QueueListener = None
+    tier_hits: Counter = None
 
     def __init__(self):
         super().__init__([])
@@ -82,14 +108,21 @@ class MainApp(qtw.QApplication):
         log_fmt += "%(message)s"
         self.log_fmt = logging.Formatter(log_fmt, datefmt="%d.%m.%Y %H:%M:%S")
         self.std_handler = utils.StdoutHandler(self)
-        self.log_str = logging.StreamHandler(self.std_handler)
-        self.log_str.setFormatter(self.log_fmt)
-        self.log.addHandler(self.log_str)
+
+        # Records are queued until the listener is started with the config
+        self.log_queue = Queue()
+        self.log_handler = utils.LogQueueHandler(self.log_queue)
+        self.log.addHandler(self.log_handler)
         self.log.setLevel(logging.DEBUG)
         self._excepthook = sys.excepthook
         sys.excepthook = self.handle_exception
 
+        self.tier_hits_lock = threading.Lock()
+
         self.dict = Dictionary()
+        self.detection_cache = DetectionCache()
+        self.scan_index = ScanIndex()
+        self.archive_cache = ArchiveCache(Path("./assets/archive_cache.db").resolve())
 
         self.root = qtw.QMainWindow()
         self.root.setWindowTitle(f"{self.name} v{self.version}")
@@ -150,13 +183,6 @@ class MainApp(qtw.QApplication):
         self.untranslated_num_label = qtw.QLabel("Untranslated Files: 0")
         self.untranslated_num_label.setObjectName("untranslated_num_label")
 
-        def incr_untranslated_mods():
-            self.untranslated_num += 1
-            self.untranslated_num_label.setText(
-                f"Untranslated Files: {self.untranslated_num}"
-            )
-
-        self.incr_untranslated_sign.connect(incr_untranslated_mods)
         self.hide_translated_button = qtw.QPushButton("Show only untranslated Files")
         self.hide_translated_button.setDisabled(True)
 
@@ -243,17 +269,49 @@ class MainApp(qtw.QApplication):
         self.browse_data_folder_button.clicked.connect(browse_data_folder)
         self.right_col_layout.addWidget(self.browse_data_folder_button, 1, 2)
 
-        thread_num_label = qtw.QLabel("Number of Threads:")
-        self.right_col_layout.addWidget(thread_num_label, 2, 0)
+        run_mode_label = qtw.QLabel("Run Mode:")
+        self.right_col_layout.addWidget(run_mode_label, 2, 0)
+
+        self.run_mode_dropdown = qtw.QComboBox()
+        self.run_mode_dropdown.setEditable(False)
+        self.run_mode_dropdown.addItems(self.RUN_MODES)
+        self.run_mode_dropdown.setCurrentIndex(0)
+        self.run_mode_dropdown.setToolTip(
+            "Full: Scans all strings of every file.\n"
+            "Triage: Samples strings of every file until it is clear\n"
+            "whether the file is translated and estimates the ratio\n"
+            "of untranslated strings.\n"
+            "Full (flagged only): Scans all strings of files that were\n"
+            "flagged as untranslated or not triaged yet."
+        )
+        self.right_col_layout.addWidget(self.run_mode_dropdown, 2, 1, 1, 2)
+
+        scan_mode_label = qtw.QLabel("Scan Mode:")
+        self.right_col_layout.addWidget(scan_mode_label, 3, 0)
+
+        self.scan_mode_dropdown = qtw.QComboBox()
+        self.scan_mode_dropdown.setEditable(False)
+        self.scan_mode_dropdown.addItems(self.SCAN_MODES)
+        self.scan_mode_dropdown.setCurrentIndex(0)
+        self.scan_mode_dropdown.setToolTip(
+            "Threads: Scans files in threads of this process.\n"
+            "Processes: Scans files in separate processes to use all CPU cores."
+        )
+        self.right_col_layout.addWidget(self.scan_mode_dropdown, 3, 1, 1, 2)
+
+        thread_num_label = qtw.QLabel("Number of Workers:")
+        self.right_col_layout.addWidget(thread_num_label, 4, 0)
 
         self.thread_num_dropdown = qtw.QComboBox()
         self.thread_num_dropdown.setEditable(False)
-        self.thread_num_dropdown.addItems([str(i) for i in range(1, 11)])
+        self.thread_num_dropdown.addItems(
+            [str(i) for i in range(1, max(10, os.cpu_count() or 1) + 1)]
+        )
         self.thread_num_dropdown.setCurrentIndex(0)
-        self.right_col_layout.addWidget(self.thread_num_dropdown, 2, 1, 1, 2)
+        self.right_col_layout.addWidget(self.thread_num_dropdown, 4, 1, 1, 2)
 
         inclusion_layout = qtw.QHBoxLayout()
-        self.right_col_layout.addLayout(inclusion_layout, 3, 0, 1, 3)
+        self.right_col_layout.addLayout(inclusion_layout, 5, 0, 1, 3)
         self.ignore_base_game_checkbox = qtw.QCheckBox(
             "Ignore Base Game plugins (& AE CC)"
         )
@@ -263,9 +321,18 @@ class MainApp(qtw.QApplication):
         inclusion_layout.addWidget(self.include_mcms_checkbox)
         self.include_scripts_checkbox = qtw.QCheckBox("Include Script files (*.pex)")
         inclusion_layout.addWidget(self.include_scripts_checkbox)
-        self.include_bsas_checkbox = qtw.QCheckBox("Include Archives (*.bsa)")
+        self.include_bsas_checkbox = qtw.QCheckBox("Include Archives (*.bsa, *.ba2)")
         inclusion_layout.addWidget(self.include_bsas_checkbox)
 
+        self.incremental_scan_checkbox = qtw.QCheckBox(
+            "Skip unchanged files (incremental scan)"
+        )
+        self.incremental_scan_checkbox.setToolTip(
+            "Restores results of files that did not change since the last scan\n"
+            "with the same languages instead of scanning them again."
+        )
+        self.right_col_layout.addWidget(self.incremental_scan_checkbox, 6, 0, 1, 3)
+
         self.status_label = qtw.QLabel()
         self.status_label.setSizePolicy(
             qtw.QSizePolicy.Policy.Maximum, qtw.QSizePolicy.Policy.Preferred
@@ -279,20 +346,20 @@ class MainApp(qtw.QApplication):
         self.progress_bar = qtw.QProgressBar()
         self.progress_bar.setFormat("%v/%m (%p%)")
         self.progress_bar.setAlignment(qtc.Qt.AlignmentFlag.AlignCenter)
-
-        def incr_progress():
-            self.progress_bar.setValue(self.progress_bar.value() + 1)
-            if self.progress_bar.value() == self.progress_bar.maximum():
-                self.done_signal.emit()
-
-        self.incr_progress_sign.connect(incr_progress)
         self.config_layout.addWidget(self.progress_bar, 2, 0, 1, 2)
 
+        # Progress of the workers is displayed in batches at about 15 Hz
+        self.progress_timer = qtc.QTimer()
+        self.progress_timer.setInterval(66)
+        self.progress_timer.timeout.connect(self.update_progress)
+
         self.copy_button = qtw.QPushButton()
         self.copy_button.setToolTip("Copy full log to clipboard")
         self.copy_button.setIcon(qta.icon("mdi6.content-copy", color="#ffffff"))
         self.copy_button.setIconSize(qtc.QSize(16, 16))
-        self.copy_button.clicked.connect(lambda: copy(self.std_handler._content))
+        self.copy_button.clicked.connect(
+            lambda: copy(self.std_handler.get_content())
+        )
         self.config_layout.addWidget(self.copy_button, 1, 2, 2, 1)
 
         # Create box
@@ -349,7 +416,7 @@ class MainApp(qtw.QApplication):
             open_explorer_action = menu.addAction("Open in Explorer (Vortex only)")
             open_explorer_action.setIcon(qta.icon("fa5s.folder", color="#ffffff"))
             open_explorer_action.triggered.connect(
-                lambda: os.system(f'explorer.exe /select,"{file.file_path}"')
+                lambda: os.system(f'explorer.exe /select,"{file.source_path}"')
             )
 
             menu.exec(self.file_list_table.mapToGlobal(point))
@@ -443,10 +510,18 @@ class MainApp(qtw.QApplication):
             "loadorder_path": self.loadorder_path_entry.text(),
             "data_path": self.data_folder_entry.text(),
             "thread_number": int(self.thread_num_dropdown.currentText()),
+            "run_mode": self.run_mode_dropdown.currentText(),
+            "scan_mode": self.scan_mode_dropdown.currentText(),
             "ignore_base_game": self.ignore_base_game_checkbox.isChecked(),
             "include_mcms": self.include_mcms_checkbox.isChecked(),
             "include_scripts": self.include_scripts_checkbox.isChecked(),
             "include_bsas": self.include_bsas_checkbox.isChecked(),
+            "incremental_scan": self.incremental_scan_checkbox.isChecked(),
+            "detection_chunk_size": self.detection_chunk_size,
+            "script_backend": self.script_backend,
+            "cascade_margin": self.cascade_margin,
+            "debug_logging": self.debug_logging,
+            "log_file": self.log_file,
         }
 
         with open(Path("./assets/config.json").resolve(), "w", encoding="utf8") as file:
@@ -467,14 +542,58 @@ class MainApp(qtw.QApplication):
             self.loadorder_path_entry.setText(config["loadorder_path"])
             self.data_folder_entry.setText(config["data_path"])
             self.thread_num_dropdown.setCurrentText(str(config["thread_number"]))
+            self.run_mode_dropdown.setCurrentText(
+                config.get("run_mode", self.RUN_MODES[0])
+            )
+            self.scan_mode_dropdown.setCurrentText(
+                config.get("scan_mode", self.SCAN_MODES[0])
+            )
             self.ignore_base_game_checkbox.setChecked(config["ignore_base_game"])
             self.include_mcms_checkbox.setChecked(config["include_mcms"])
             self.include_scripts_checkbox.setChecked(config["include_scripts"])
             self.include_bsas_checkbox.setChecked(config["include_bsas"])
+            self.incremental_scan_checkbox.setChecked(
+                config.get("incremental_scan", False)
+            )
+            self.detection_chunk_size = config.get(
+                "detection_chunk_size", self.detection_chunk_size
+            )
+            self.script_backend = config.get("script_backend", self.script_backend)
+            if self.script_backend not in ScriptEntry.BACKENDS:
+                self.script_backend = ScriptEntry.BACKENDS[0]
+            self.cascade_margin = config.get("cascade_margin", self.cascade_margin)
+            self.debug_logging = config.get("debug_logging", self.debug_logging)
+            self.log_file = config.get("log_file", self.log_file)
 
             return True
         return False
 
+    def start_logging(self):
+        """
+        Starts thread that writes queued log records to the log view
+        and, if enabled, to a rotating log file.
+        """
+
+        # Debug messages are dropped before they are formatted if disabled
+        self.log.setLevel(logging.DEBUG if self.debug_logging else logging.INFO)
+
+        stream_handler = logging.StreamHandler(self.std_handler)
+        stream_handler.setFormatter(self.log_fmt)
+        handlers: list[logging.Handler] = [stream_handler]
+
+        if self.log_file:
+            file_handler = RotatingFileHandler(
+                Path("./assets/log.txt").resolve(),
+                maxBytes=5 * 1024 * 1024,
+                backupCount=3,
+                encoding="utf8",
+            )
+            file_handler.setFormatter(self.log_fmt)
+            handlers.append(file_handler)
+
+        self.log_listener = QueueListener(self.log_queue, *handlers)
+        self.log_listener.start()
+
     def get_paths(self):
         # Insert loadorder.txt path
         self.loadorder_path_entry.setText(
@@ -506,52 +625,24 @@ class MainApp(qtw.QApplication):
                 "Failed to get installation path from registry: Registry key not found!",
             )
 
-    def extract_mcms_from_bsas(self, bsa_archives: list[Path]):
+    def find_in_bsas(self, bsa_archives: list[Path]):
         """
-        Extracts MCM translation files from BSAs to tempfolder
-        and returns their paths.
+        Indexes BSAs once and returns MCM translation files
+        and PEX files in them. The files are read directly
+        from the BSAs without extracting them.
         """
 
-        mcm_files: list[Path] = []
         desired_lang = self.desired_lang_dropdown.currentText().lower()
-        tempfolder = Path("temp").resolve()
-        os.makedirs(tempfolder, exist_ok=True)
-
-        for bsa_archive in bsa_archives:
-            try:
-                archive = ArchiveParser(bsa_archive).parse_archive()
-
-                for mcm_file in archive.glob(f"*_{desired_lang}.txt"):
-                    archive.extract_file(mcm_file, tempfolder)
-                    mcm_files.append(tempfolder / mcm_file.name)
-            except:
-                self.log.error(f"Failed to parse BSA {bsa_archive.name!r}!")
-                continue
-
-        return mcm_files
 
-    def extract_scripts_from_bsas(self, bsa_archives: list[Path]):
-        """
-        Extracts PEX files from BSAs to tempfolder
-        and returns their paths.
-        """
-
-        script_files: list[Path] = []
-        tempfolder = Path("temp").resolve()
-        os.makedirs(tempfolder, exist_ok=True)
+        archive_index = ArchiveIndex(bsa_archives, self.archive_cache)
+        mcm_files, script_files = archive_index.glob(
+            [f"interface/translations/*_{desired_lang}.txt", "scripts/*.pex"]
+        )
 
-        for bsa_archive in bsa_archives:
-            try:
-                archive = ArchiveParser(bsa_archive).parse_archive()
+        for bsa_archive in archive_index.failed_archives:
+            self.log.error(f"Failed to parse BSA {bsa_archive.name!r}!")
 
-                for script_file in archive.glob(f"*.pex"):
-                    archive.extract_file(script_file, tempfolder)
-                    script_files.append(tempfolder / script_file.name)
-            except:
-                self.log.error(f"Failed to parse BSA {bsa_archive.name!r}!")
-                continue
-
-        return script_files
+        return mcm_files, script_files
 
     def load_files(self):
         """
@@ -601,22 +692,22 @@ class MainApp(qtw.QApplication):
 
             self.log.info(f"Loaded {len(mcm_files)} MCM file(s).")
 
-            self.log.info("Extracting MCM files from BSAs...")
-            ldialog.updateProgress(text1="Extracting MCM files from BSAs...")
+            self.log.info("Indexing BSAs...")
+            ldialog.updateProgress(text1="Indexing BSAs...")
 
             bsa_paths = [
                 bsa_path
                 for plugin in loadorder
-                if (bsa_path := plugin.with_suffix(".bsa")).is_file()
+                for suffix in [".bsa", ".ba2"]
+                if (bsa_path := plugin.with_suffix(suffix)).is_file()
             ]
-            extracted_mcms = self.extract_mcms_from_bsas(bsa_paths)
+            bsa_mcms, bsa_scripts = self.find_in_bsas(bsa_paths)
 
-            for file_path in extracted_mcms:
-                file = MCMEntry(app=self, file=file_path)
+            for archive_member in bsa_mcms:
+                file = MCMEntry(app=self, file=None, archive_member=archive_member)
                 self.all_files.append(file)
-                file.bsa = True
 
-            self.log.info(f"Extracted {len(extracted_mcms)} MCM file(s) from BSAs.")
+            self.log.info(f"Found {len(bsa_mcms)} MCM file(s) in BSAs.")
 
             # Load scripts
             self.log.info("Loading script files...")
@@ -632,24 +723,11 @@ class MainApp(qtw.QApplication):
 
             self.log.info(f"Loaded {len(script_files)} script file(s).")
 
-            self.log.info("Extracting scripts from BSAs...")
-            ldialog.updateProgress(text1="Extracting scripts from BSAs...")
-
-            bsa_paths = [
-                bsa_path
-                for plugin in loadorder
-                if (bsa_path := plugin.with_suffix(".bsa")).is_file()
-            ]
-            extracted_scripts = self.extract_scripts_from_bsas(bsa_paths)
-
-            for file_path in extracted_scripts:
-                file = ScriptEntry(app=self, file=file_path)
+            for archive_member in bsa_scripts:
+                file = ScriptEntry(app=self, file=None, archive_member=archive_member)
                 self.all_files.append(file)
-                file.bsa = True
 
-            self.log.info(
-                f"Extracted {len(extracted_scripts)} script file(s) from BSAs."
-            )
+            self.log.info(f"Found {len(bsa_scripts)} script file(s) in BSAs.")
 
         loadingdialog = LoadingDialog(parent=self.root, app=self, func=process)
         loadingdialog.exec()
@@ -695,6 +773,7 @@ class MainApp(qtw.QApplication):
         self.root.showMaximized()
         if not self.load_config():
             self.get_paths()
+        self.start_logging()
         self.load_files()
         self.loadorder_path_entry.textChanged.connect(self.load_files)
         self.data_folder_entry.textChanged.connect(self.load_files)
@@ -729,6 +808,11 @@ class MainApp(qtw.QApplication):
         if self.dict.edids or self.dict.strings:
             self.dict.save_dictionary()
 
+        self.detection_cache.save_cache()
+        self.scan_index.save_index()
+
+        self.log_listener.stop()
+
         if (tempfolder := Path("temp").resolve()).is_dir():
             shutil.rmtree(tempfolder)
 
@@ -737,31 +821,58 @@ class MainApp(qtw.QApplication):
         Runs scan according to user configuration.
         """
 
-        self.original_lang = Language[self.original_lang_dropdown.currentText().upper()]
-        self.desired_lang = Language[self.desired_lang_dropdown.currentText().upper()]
+        self.original_lang = getattr(
+            Language, self.original_lang_dropdown.currentText().upper()
+        )
+        self.desired_lang = getattr(
+            Language, self.desired_lang_dropdown.currentText().upper()
+        )
         self.num_threads = int(self.thread_num_dropdown.currentText())
+        self.run_mode = self.run_mode_dropdown.currentText()
+        self.scan_mode = self.scan_mode_dropdown.currentText()
         self.ignore_base_game = self.ignore_base_game_checkbox.isChecked()
         self.include_mcms = self.include_mcms_checkbox.isChecked()
         self.include_scripts = self.include_scripts_checkbox.isChecked()
         self.include_bsas = self.include_bsas_checkbox.isChecked()
+        self.incremental_scan = self.incremental_scan_checkbox.isChecked()
+        ScriptEntry.backend = self.script_backend
+        LangDetector.cascade_margin = self.cascade_margin
+        self.tier_hits = Counter()
+        self.scan_context = ScanIndex.get_context(
+            [self.original_lang, self.desired_lang],
+            CONFIDENCE,
+            self.version,
+            self.script_backend,
+            self.cascade_margin,
+        )
 
         self.log.debug(f"Original language: {self.original_lang}")
         self.log.debug(f"Desired language: {self.desired_lang}")
-        self.log.debug(f"Number of threads: {self.num_threads}")
+        self.log.debug(f"Run mode: {self.run_mode}")
+        self.log.debug(f"Scan mode: {self.scan_mode}")
+        self.log.debug(f"Number of workers: {self.num_threads}")
+        self.log.debug(f"Detection chunk size: {self.detection_chunk_size}")
+        self.log.debug(f"Script backend: {self.script_backend}")
+        self.log.debug(f"Cascade margin: {self.cascade_margin}")
+        self.log.debug(f"Log file: {self.log_file}")
         self.log.debug(f"Ignore base game: {self.ignore_base_game}")
         self.log.debug(f"Include MCM translations: {self.include_mcms}")
         self.log.debug(f"Include Scripts: {self.include_scripts}")
+        self.log.debug(f"Incremental scan: {self.incremental_scan}")
         self.log.info("Running scan...")
 
         self.hide_translated_button.setDisabled(False)
         self.run_button.setDisabled(True)
         self.original_lang_dropdown.setDisabled(True)
         self.desired_lang_dropdown.setDisabled(True)
+        self.run_mode_dropdown.setDisabled(True)
+        self.scan_mode_dropdown.setDisabled(True)
         self.thread_num_dropdown.setDisabled(True)
         self.ignore_base_game_checkbox.setDisabled(True)
         self.include_mcms_checkbox.setDisabled(True)
         self.include_scripts_checkbox.setDisabled(True)
         self.include_bsas_checkbox.setDisabled(True)
+        self.incremental_scan_checkbox.setDisabled(True)
         self.loadorder_path_entry.setDisabled(True)
         self.browse_loadorder_button.setDisabled(True)
         self.data_folder_entry.setDisabled(True)
@@ -772,26 +883,101 @@ class MainApp(qtw.QApplication):
         if (output_dir := Path("Output").resolve()).is_dir():
             shutil.rmtree(output_dir)
 
+        # Files that were triaged as translated are not scanned again
+        if self.run_mode == "Full (flagged only)":
+            self.scan_files = [
+                file_entry
+                for file_entry in self.relevant_files
+                if file_entry.triage_result is None
+                or file_entry.triage_result.untranslated
+            ]
+            self.log.info(
+                f"Skipping {len(self.relevant_files) - len(self.scan_files)} "
+                "file(s) that were triaged as translated."
+            )
+        else:
+            self.scan_files = list(self.relevant_files)
+
         self.queue = Queue()
-        for file in self.relevant_files:
-            self.queue.put(file)
+        for item in self.get_work_items(self.scan_files):
+            self.queue.put(item)
+
+        self.progress_tracker = ProgressTracker()
 
         self.progress_bar.setObjectName("")
         self.progress_bar.setStyleSheet(self.styleSheet())
         self.progress_bar.setValue(0)
-        self.progress_bar.setRange(0, len(self.relevant_files))
+        self.progress_bar.setRange(0, len(self.scan_files))
 
         self.start_time = time.strftime("%H:%M:%S")
 
         self.threads.clear()
-        for _ in range(self.num_threads):
-            thread = utils.Thread(target=self.file_thread, parent=self)
+        if not self.scan_files:
+            self.done_signal.emit()
+            return
+
+        self.progress_timer.start()
+
+        if self.scan_mode == "Processes":
+            thread = utils.Thread(target=self.process_pool_thread, parent=self)
             thread.start()
             self.threads.append(thread)
+        else:
+            for _ in range(self.num_threads):
+                thread = utils.Thread(target=self.file_thread, parent=self)
+                thread.start()
+                self.threads.append(thread)
+
+    def update_progress(self):
+        """
+        Displays progress of all files that changed since the last call
+        and updates the main progress bar. Called by the progress timer.
+        """
+
+        finished = 0
+        untranslated = 0
+
+        for progress in self.progress_tracker.drain():
+            file_entry = progress.file_entry
+
+            if progress.displayed:
+                continue
+
+            if progress.finished:
+                progress.displayed = True
+                finished += 1
+
+                if progress.num_text is not None:
+                    file_entry.set_num_sign.emit(progress.num_text)
+                if progress.untranslated:
+                    untranslated += 1
+                    file_entry.enable_preview_btn_sign.emit()
+                if progress.failed:
+                    file_entry.progress_error_sign.emit()
+            else:
+                file_entry.progress_sign.emit((0, progress.maximum, progress.value))
+
+            file_entry.status_sign.emit(progress.get_status_text())
+
+        if untranslated:
+            self.untranslated_num += untranslated
+            self.untranslated_num_label.setText(
+                f"Untranslated Files: {self.untranslated_num}"
+            )
+
+        if finished:
+            self.progress_bar.setValue(self.progress_bar.value() + finished)
+
+            if self.progress_bar.value() == self.progress_bar.maximum():
+                self.progress_timer.stop()
+                self.done_signal.emit()
 
     def on_finish(self):
         end_time = utils.get_diff(self.start_time, time.strftime("%H:%M:%S"))
         self.log.info(f"Scan complete in {end_time}!")
+        self.log.info(
+            f"Detection tiers: {LangDetector.format_tier_hits(self.tier_hits)}"
+        )
 
         self.threads.clear()
 
@@ -802,11 +988,14 @@ class MainApp(qtw.QApplication):
         self.run_button.setEnabled(True)
         self.original_lang_dropdown.setDisabled(False)
         self.desired_lang_dropdown.setDisabled(False)
+        self.run_mode_dropdown.setDisabled(False)
+        self.scan_mode_dropdown.setDisabled(False)
         self.thread_num_dropdown.setDisabled(False)
         self.ignore_base_game_checkbox.setDisabled(False)
         self.include_mcms_checkbox.setDisabled(False)
         self.include_scripts_checkbox.setDisabled(False)
         self.include_bsas_checkbox.setDisabled(False)
+        self.incremental_scan_checkbox.setDisabled(False)
         self.loadorder_path_entry.setDisabled(False)
         self.browse_loadorder_button.setDisabled(False)
         self.data_folder_entry.setDisabled(False)
@@ -838,69 +1027,392 @@ class MainApp(qtw.QApplication):
         utils.apply_dark_titlebar(message_box)
         message_box.exec()
 
+    def get_work_items(self, files: list[FileEntry]):
+        """
+        Returns items for the work queue of the file threads.
+
+        Files in archives are grouped into batches per archive that
+        are read in bulk. Scripts that are decompiled with Champollion
+        are grouped into batches that are decompiled with one call each.
+        """
+
+        if self.scan_mode == "Processes":
+            return list(files)
+
+        scripts: list[ScriptEntry] = []
+        if ScriptEntry.backend == "Champollion":
+            scripts = [file for file in files if isinstance(file, ScriptEntry)]
+
+        script_set = set(scripts)
+        remaining_files = [file for file in files if file not in script_set]
+        archive_files = [
+            file for file in remaining_files if file.archive_member is not None
+        ]
+        other_files = [file for file in remaining_files if file.archive_member is None]
+
+        # Spread batches over all threads
+        script_batch_size = min(
+            ScriptEntry.batch_size, max(1, -(-len(scripts) // self.num_threads))
+        )
+        batches = ScriptEntry.get_batches(scripts, script_batch_size)
+
+        files_per_archive: dict[Path, list[FileEntry]] = {}
+        for file in archive_files:
+            files_per_archive.setdefault(file.source_path, []).append(file)
+
+        archive_batch_size = min(
+            self.archive_batch_size,
+            max(1, -(-len(archive_files) // self.num_threads)),
+        )
+        for files_in_archive in files_per_archive.values():
+            for i in range(0, len(files_in_archive), archive_batch_size):
+                batches.append(files_in_archive[i : i + archive_batch_size])
+
+        return batches + other_files
+
     def file_thread(self):
         """
         Thread function that processes plugins.
         """
 
-        lang_detector = LangDetector(self)
+        lang_detector = LangDetector(self, chunk_size=self.detection_chunk_size)
         lang_detector.set_langs([self.original_lang, self.desired_lang])
 
         while True:
             try:
-                file_entry: FileEntry = self.queue.get(False)
+                item: FileEntry | list[FileEntry] = self.queue.get(False)
             except Empty:
                 break
 
-            try:
-                file_entry.progress_sign.emit((0, 0, 0))
+            if isinstance(item, list):
+                self.process_batch(lang_detector, item)
+            else:
+                self.process_file(lang_detector, item)
+
+            self.queue.task_done()
 
-                file_entry.status_sign.emit("Extracting strings...")
-                file_entry.extract_strings()
+    def process_file(
+        self, lang_detector: LangDetector, file_entry: FileEntry, restore: bool = True
+    ):
+        """
+        Scans <file_entry> for untranslated strings
+        if it can't be restored from scan index.
+        """
+
+        try:
+            if restore and self.restore_file(file_entry):
+                return
+
+            if self.run_mode == "Triage":
+                self.triage_file(lang_detector, file_entry)
+            else:
+                progress = self.progress_tracker.get(file_entry)
+                progress.set_progress(0, 0)
 
-                file_entry.status_sign.emit("Scanning for untranslated strings...")
+                # Strings are extracted while the detector consumes them
+                progress.set_status("Extracting strings...")
                 file_entry.untranslated_strings = (
                     lang_detector.clean_target_lang_strings(
-                        file_entry.strings,
-                        self.desired_lang,
-                        file_entry.progress_sign,
-                        file_entry.status_sign,
+                        file_entry.iter_strings(), self.desired_lang, progress
                     )
                 )
-                file_entry.set_num_sign.emit(
-                    f"{len(file_entry.untranslated_strings)}/{len(file_entry.strings)}"
-                )
-                if file_entry.untranslated_strings:
-                    self.incr_untranslated_sign.emit()
-                    file_entry.enable_preview_btn_sign.emit()
-                    os.makedirs(Path("Output").resolve(), exist_ok=True)
-                    with open(
-                        Path("Output").resolve() / f"{file_entry.file_path.name}.json",
-                        mode="w",
-                        encoding="utf-8",
-                    ) as file:
-                        json.dump(
-                            file_entry.untranslated_strings,
-                            file,
-                            indent=4,
-                            ensure_ascii=False,
-                        )
-
-                self.log.info(
-                    f"Finished '{file_entry.file_path.name}'. ({self.progress_bar.value()}/{self.progress_bar.maximum()})"
-                )
+                file_entry.string_count = len(file_entry.strings)
+                self.add_tier_hits(lang_detector.pop_tier_hits())
+                self.finish_file(file_entry)
+        except Exception as ex:
+            self.fail_file(file_entry, ex)
+
+    def triage_file(self, lang_detector: LangDetector, file_entry: FileEntry):
+        """
+        Samples strings of <file_entry> until it is decided
+        whether it is translated.
+        """
 
-                file_entry.status_sign.emit("Done")
-                self.incr_progress_sign.emit()
-                self.queue.task_done()
+        progress = self.progress_tracker.get(file_entry)
+        progress.set_progress(0, 0)
+        progress.set_status("Extracting strings...")
+        strings = file_entry.extract_strings()
+
+        progress.set_status("Triaging...")
+        result = lang_detector.triage(strings, self.desired_lang, progress)
+        self.add_tier_hits(lang_detector.pop_tier_hits())
+        self.finish_triage(file_entry, result)
+
+    def add_tier_hits(self, tier_hits: Counter):
+        """
+        Adds <tier_hits> of a detector to the statistics of this scan.
+        """
+
+        with self.tier_hits_lock:
+            self.tier_hits.update(tier_hits)
+
+    def process_batch(self, lang_detector: LangDetector, file_entries: list[FileEntry]):
+        """
+        Reads files of <file_entries> that are in archives in bulk,
+        decompiles scripts in one batch if Champollion is used
+        and scans them. The read content is dropped afterwards.
+        """
+
+        pending = [entry for entry in file_entries if not self.restore_file(entry)]
+        if not pending:
+            return
+
+        self.read_archive_files(pending)
+
+        scripts = [entry for entry in pending if isinstance(entry, ScriptEntry)]
+        batch_folder: Path = None
+
+        if scripts and ScriptEntry.backend == "Champollion":
+            batch_folder = Path("temp").resolve() / f"batch_{id(file_entries)}"
+
+            for entry in scripts:
+                progress = self.progress_tracker.get(entry)
+                progress.set_progress(0, 0)
+                progress.set_status("Decompiling...")
+
+            try:
+                ScriptEntry.decompile_batch(scripts, batch_folder)
             except Exception as ex:
-                self.log.error(
-                    f"Failed to process file '{file_entry.file_path.name}': {ex}"
+                self.log.warning(
+                    f"Failed to decompile batch of {len(scripts)} script(s): {ex}"
                 )
-                file_entry.status_sign.emit(f"Error: {ex}")
-                file_entry.progress_error_sign.emit()
-                self.incr_progress_sign.emit()
-                self.queue.task_done()
+
+        # Scripts that failed in the batch are decompiled one by one
+        for entry in pending:
+            self.process_file(lang_detector, entry, restore=False)
+            entry.content = None
+            if isinstance(entry, ScriptEntry):
+                entry.psc_path = None
+
+        if batch_folder is not None:
+            shutil.rmtree(batch_folder, ignore_errors=True)
+
+    def read_archive_files(self, file_entries: list[FileEntry]):
+        """
+        Reads content of files of <file_entries> that are in archives
+        in bulk. Files that fail are read again when they are scanned.
+        """
+
+        archive_files: dict[ArchiveMember, FileEntry] = {
+            entry.archive_member: entry
+            for entry in file_entries
+            if entry.archive_member is not None and entry.content is None
+        }
+        if not archive_files:
+            return
+
+        bulk_reader = BulkReader()
+        for archive_member, content in bulk_reader.read(list(archive_files)):
+            archive_files[archive_member].content = content
+
+        for archive_member, ex in bulk_reader.failed:
+            self.log.warning(
+                f"Failed to read '{archive_member.path}' from "
+                f"'{archive_member.archive_path.name}': {ex}"
+            )
+
+    def process_pool_thread(self):
+        """
+        Thread function that distributes files to a pool of
+        worker processes and passes their results and progress
+        to the file entries.
+        """
+
+        files = [
+            file_entry
+            for file_entry in self.scan_files
+            if not self.restore_file(file_entry)
+        ]
+        if not files:
+            return
+
+        context = multiprocessing.get_context("spawn")
+        progress_queue = context.Queue()
+        langs = [self.original_lang, self.desired_lang]
+
+        # Workers only get the cached results of the current scope
+        cache_entries = self.detection_cache.get_entries(
+            DetectionCache.get_scope(langs, CONFIDENCE, self.cascade_margin)
+        )
+        finished_files: set[FileEntry] = set()
+
+        def drain_progress_queue():
+            while True:
+                try:
+                    index, method_name, args = progress_queue.get(False)
+                except Empty:
+                    break
+
+                # Ignore late progress of files that are already done
+                if files[index] not in finished_files:
+                    progress = self.progress_tracker.get(files[index])
+                    getattr(progress, method_name)(*args)
+
+        with ProcessPoolExecutor(
+            max_workers=self.num_threads,
+            mp_context=context,
+            initializer=scan_worker.init_worker,
+            initargs=(
+                [lang.name for lang in langs],
+                self.desired_lang.name,
+                list(self.dict.edids),
+                list(self.dict.strings),
+                cache_entries,
+                self.detection_chunk_size,
+                self.script_backend,
+                self.cascade_margin,
+                progress_queue,
+            ),
+        ) as executor:
+            if self.run_mode == "Triage":
+                worker_func = scan_worker.triage_file
+            else:
+                worker_func = scan_worker.scan_file
+
+            futures: dict[Future, FileEntry] = {
+                executor.submit(
+                    worker_func,
+                    index,
+                    type(file_entry).__name__,
+                    file_entry.file_path,
+                    file_entry.archive_member,
+                ): file_entry
+                for index, file_entry in enumerate(files)
+            }
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                drain_progress_queue()
+
+                for future in done:
+                    file_entry = futures[future]
+                    finished_files.add(file_entry)
+
+                    try:
+                        if self.run_mode == "Triage":
+                            _, result, cache_entries, tier_hits = future.result()
+
+                            self.detection_cache.add_entries(cache_entries)
+                            self.add_tier_hits(tier_hits)
+                            self.finish_triage(file_entry, result)
+                            continue
+
+                        (
+                            _,
+                            string_count,
+                            untranslated_strings,
+                            cache_entries,
+                            tier_hits,
+                        ) = future.result()
+
+                        file_entry.string_count = string_count
+                        file_entry.untranslated_strings = untranslated_strings
+                        self.detection_cache.add_entries(cache_entries)
+                        self.add_tier_hits(tier_hits)
+                        self.finish_file(file_entry)
+                    except Exception as ex:
+                        self.fail_file(file_entry, ex)
+
+        progress_queue.close()
+
+    def restore_file(self, file_entry: FileEntry):
+        """
+        Restores result of <file_entry> from scan index if
+        incremental scan is enabled and the file did not change.
+        Returns True if the file was restored.
+        """
+
+        if not self.incremental_scan:
+            return False
+
+        try:
+            restored = self.scan_index.restore(
+                file_entry, self.scan_context, self.dict
+            )
+        except Exception as ex:
+            self.log.warning(
+                f"Failed to restore '{file_entry.file_path.name}' from scan index: {ex}"
+            )
+            return False
+
+        if restored:
+            self.finish_file(file_entry, restored=True)
+
+        return restored
+
+    def finish_file(self, file_entry: FileEntry, restored: bool = False):
+        """
+        Displays and saves scan result of <file_entry>.
+        Results that were <restored> from scan index are not stored again.
+        """
+
+        if not restored and self.incremental_scan:
+            self.scan_index.store(file_entry, self.scan_context, self.dict)
+
+        if file_entry.untranslated_strings:
+            os.makedirs(Path("Output").resolve(), exist_ok=True)
+            with open(
+                Path("Output").resolve() / f"{file_entry.file_path.name}.json",
+                mode="w",
+                encoding="utf-8",
+            ) as file:
+                json.dump(
+                    file_entry.untranslated_strings,
+                    file,
+                    indent=4,
+                    ensure_ascii=False,
+                )
+
+        self.log.info(
+            f"Finished '{file_entry.file_path.name}'. ({self.progress_bar.value()}/{self.progress_bar.maximum()})"
+        )
+
+        self.progress_tracker.get(file_entry).finish(
+            "Unchanged" if restored else "Done",
+            f"{len(file_entry.untranslated_strings)}/{file_entry.string_count}",
+            untranslated=bool(file_entry.untranslated_strings),
+        )
+
+    def finish_triage(self, file_entry: FileEntry, result: TriageResult):
+        """
+        Displays triage result of <file_entry>.
+        Triage results are not stored in the scan index.
+        """
+
+        file_entry.triage_result = result
+        file_entry.string_count = result.total
+        file_entry.untranslated_strings = (
+            result.untranslated_strings if result.untranslated else []
+        )
+
+        if result.exhaustive:
+            num_text = f"{len(result.untranslated_strings)}/{result.total}"
+        else:
+            num_text = (
+                f"~{result.ratio:.0%} "
+                f"({result.lower_bound:.0%}-{result.upper_bound:.0%})"
+            )
+
+        self.log.info(
+            f"Triaged '{file_entry.file_path.name}' after "
+            f"{result.sampled}/{result.total} string(s). "
+            f"({self.progress_bar.value()}/{self.progress_bar.maximum()})"
+        )
+
+        self.progress_tracker.get(file_entry).finish(
+            "Flagged" if result.untranslated else "Translated",
+            num_text,
+            untranslated=result.untranslated,
+        )
+
+    def fail_file(self, file_entry: FileEntry, ex: Exception):
+        """
+        Displays error <ex> that occured while processing <file_entry>.
+        """
+
+        self.log.error(f"Failed to process file '{file_entry.file_path.name}': {ex}")
+        self.progress_tracker.get(file_entry).finish(f"Error: {ex}", failed=True)
 
     def __repr__(self):
         return "MainApp"
@@ -933,6 +1445,8 @@ class MainApp(qtw.QApplication):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
     from updater import Updater
 
     app = MainApp()
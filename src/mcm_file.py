@@ -4,6 +4,8 @@ and falls under the license
 GNU General Public License v3.0.
 """
 
+from io import BytesIO, TextIOWrapper
+
 from file_entry import FileEntry
 
 
@@ -19,7 +21,7 @@ class MCMEntry(FileEntry):
 
         result: list[dict[str, str]] = []
 
-        with open(self.file_path, "r", encoding="utf-16") as file:
+        with TextIOWrapper(BytesIO(self.read_bytes()), encoding="utf-16") as file:
             for line in file.readlines():
                 if not line.strip():
                     continue
@@ -18,16 +18,20 @@ class PluginEntry(FileEntry):
         Extracts strings from plugin.
         """
 
-        parser = PluginParser(self.file_path)
-        parser.parse_plugin()
-        result: list[dict[str, str]] = []
-
-        strings = parser.extract_strings()
-
-        for group in strings.values():
-            result += group
+        result = list(PluginParser(self.file_path).iter_strings())
 
         self.strings = result
         return result
 
+    def iter_strings(self):
+        """
+        Extracts strings from plugin while they are consumed.
+        """
+
+        self.strings = []
+
+        for string in PluginParser(self.file_path).iter_strings():
+            self.strings.append(string)
+            yield string
+
 
@@ -280,4 +280,12 @@ class Hex:
 
     @staticmethod
     def hex(stream: BufferedReader, size: int):
-        return hex(Integer._int(stream, size)).removeprefix("0x").upper().zfill(8)
+        return Hex.format(Integer._int(stream, size))
+
+    @staticmethod
+    def format(value: int) -> str:
+        """
+        Formats <value> as upper-case, zero-padded hex string.
+        """
+
+        return hex(value).removeprefix("0x").upper().zfill(8)
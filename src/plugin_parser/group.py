@@ -3,12 +3,34 @@ Copyright (c) Cutleast
 """
 
 import os
+import struct
 from enum import IntEnum
-from io import BufferedReader, BytesIO
+from io import BytesIO
 
 from .datatypes import Hex, Integer, String
 from .record import Record
 from .utilities import PARSE_WHITELIST
+from .view_stream import ViewStream
+
+# Record types that can be children of cells
+CELL_CHILD_TYPES = [
+    "REFR",
+    "ACHR",
+    "NAVM",
+    "LAND",
+    "PGRE",
+    "PHZD",
+    "PMIS",
+    "PARW",
+    "PBAR",
+    "PBEA",
+    "PCON",
+    "PFLA",
+]
+PARSE_CELL_CHILDREN = any(
+    record_type in PARSE_WHITELIST for record_type in CELL_CHILD_TYPES
+)
+PARSE_CELLS = "CELL" in PARSE_WHITELIST or PARSE_CELL_CHILDREN
 
 
 class Group:
@@ -17,7 +39,11 @@ class Group:
     """
 
     type = "GRUP"
-    stream: BufferedReader = None
+    stream: ViewStream = None
+
+    # Type, size, label, group type, timestamp,
+    # version control info, unknown
+    HEADER = struct.Struct("<4sI4siHHI")
     records: list[Record] = None
 
     class GroupType(IntEnum):
@@ -36,10 +62,11 @@ class Group:
         CellPersistentChildren = 8  # Persistent Cell Record
         CellTemporaryChildren = 9  # Temporary Cell Record
 
-    def __init__(self, stream: BufferedReader):
+    def __init__(self, stream: ViewStream, parse: bool = True):
         self.stream = stream
 
-        self.parse()
+        if parse:
+            self.parse()
 
     def __len__(self):
         try:
@@ -50,42 +77,41 @@ class Group:
         except AttributeError:
             return 0
 
-    def parse(self):
-        self.type = String.string(self.stream, 4)
-        self.group_size = Integer.uint32(self.stream)
-        self.label = self.stream.read(4)
-        self.group_type = Integer.int32(self.stream)
-        self.timestamp = Integer.uint16(self.stream)
-        self.version_control_info = Integer.uint16(self.stream)
-        _ = Integer.uint32(self.stream)
+    def parse_header(self):
+        """
+        Parses group header and label.
+        Sets `whitelisted` to whether the records of the group
+        have to be parsed.
+        """
+
+        (
+            group_type,
+            self.group_size,
+            self.label,
+            self.group_type,
+            self.timestamp,
+            self.version_control_info,
+            _,
+        ) = self.stream.unpack(Group.HEADER)
+        self.type = group_type.decode()
 
-        self.data = self.stream.read(len(self))
+        self.whitelisted = True
 
         match self.group_type:
             # Normal groups
             case Group.GroupType.Normal:
                 self.label = String.string(BytesIO(self.label), 4)
-
-                if self.label in PARSE_WHITELIST:
-                    record_stream = BytesIO(self.data)
-                    self.parse_records(record_stream)
-                else:
-                    self.records = []
+                self.whitelisted = self.label in PARSE_WHITELIST
 
             # Dialogue Groups
             case Group.GroupType.TopicChildren:
                 self.label = Hex.hex(BytesIO(self.label), 4)
-
-                if "DIAL" in PARSE_WHITELIST:
-                    record_stream = BytesIO(self.data)
-                    self.parse_records(record_stream)
-                else:
-                    self.records = []
+                self.whitelisted = "DIAL" in PARSE_WHITELIST
 
             # Worldspace Group
             case Group.GroupType.WorldChildren:
                 self.label = Hex.hex(BytesIO(self.label), 4)
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELLS
 
             # Exterior Cells
             case Group.GroupType.ExteriorCellBlock:
@@ -94,7 +120,7 @@ class Group:
                     Integer.int16(label_stream),  # Y
                     Integer.int16(label_stream),  # X
                 )
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELLS
 
             case Group.GroupType.ExteriorCellSubBlock:
                 label_stream = BytesIO(self.label)
@@ -102,37 +128,51 @@ class Group:
                     Integer.int16(label_stream),  # Y
                     Integer.int16(label_stream),  # X
                 )
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELLS
 
             # Interior Cells
             case Group.GroupType.InteriorCellBlock:
                 self.block_number = Integer.int32(BytesIO(self.label))
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELLS
 
             case Group.GroupType.InteriorCellSubBlock:
                 self.subblock_number = Integer.int32(BytesIO(self.label))
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELLS
 
             # Cell Children
             case Group.GroupType.CellChildren:
                 self.label = Hex.hex(BytesIO(self.label), 4)
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELL_CHILDREN
 
             case Group.GroupType.CellPersistentChildren:
                 self.parent_cell = Hex.hex(BytesIO(self.label), 4)
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELL_CHILDREN
 
             case Group.GroupType.CellTemporaryChildren:
                 self.parent_cell = Hex.hex(BytesIO(self.label), 4)
-                self.parse_records(BytesIO(self.data))
+                self.whitelisted = PARSE_CELL_CHILDREN
 
             # Unknown
             case _:
                 print("Unknown Group Type:", self.group_type)
+                self.whitelisted = False
 
         return self
 
-    def parse_records(self, stream: BytesIO):
+    def parse(self):
+        self.parse_header()
+
+        if self.whitelisted:
+            with self.stream.substream(len(self)) as record_stream:
+                self.parse_records(record_stream)
+        else:
+            # Skip group data without reading it
+            self.stream.seek(len(self), os.SEEK_CUR)
+            self.records = []
+
+        return self
+
+    def parse_records(self, stream: ViewStream):
         self.records: list[Record] = []
 
         while record_type := String.string(stream, 4):
@@ -145,3 +185,24 @@ class Group:
             self.records.append(record)
 
         return self
+
+    def iter_records(self):
+        """
+        Parses group and yields its records and the records of its
+        subgroups one by one without storing them or the group data.
+        """
+
+        self.parse_header()
+
+        if not self.whitelisted:
+            # Skip group data without reading it
+            self.stream.seek(len(self), os.SEEK_CUR)
+            return
+
+        with self.stream.substream(len(self)) as stream:
+            while record_type := String.string(stream, 4):
+                stream.seek(-4, os.SEEK_CUR)
+                if record_type == "GRUP":
+                    yield from Group(stream, parse=False).iter_records()
+                else:
+                    yield Record(stream)
@@ -3,11 +3,11 @@ Copyright (c) Cutleast
 """
 
 from dataclasses import dataclass
-from io import BufferedReader
 
 from . import utilities as utils
 from .group import Group
 from .record import Record
+from .view_stream import ViewStream
 
 
 @dataclass
@@ -16,7 +16,7 @@ class Plugin:
     Contains parsed plugin data.
     """
 
-    data_stream: BufferedReader
+    data_stream: ViewStream
     header: Record = None
     groups: list[Group] = None
 
@@ -29,3 +29,14 @@ class Plugin:
             self.groups.append(Group(self.data_stream))
 
         return self
+
+    def iter_records(self):
+        """
+        Parses plugin and yields its records one by one
+        without building the group tree.
+        """
+
+        self.header = Record(self.data_stream)
+
+        while utils.peek(self.data_stream, 1):
+            yield from Group(self.data_stream, parse=False).iter_records()
@@ -2,6 +2,7 @@
 Copyright (c) Cutleast
 """
 
+import mmap
 from io import BufferedReader
 from pathlib import Path
 
@@ -9,6 +10,7 @@ from .group import Group
 from .plugin import Plugin
 from .record import Record
 from .subrecord import EDID, StringSubrecord
+from .view_stream import ViewStream
 
 
 class PluginParser:
@@ -28,7 +30,9 @@ class PluginParser:
     """
 
     plugin_path: Path = None
-    plugin_stream: BufferedReader = None
+    plugin_file: BufferedReader = None
+    plugin_map: mmap.mmap = None
+    plugin_stream: ViewStream = None
     parsed_data: Plugin = None
 
     def __init__(self, plugin_path: Path):
@@ -36,21 +40,39 @@ class PluginParser:
 
     def open_stream(self):
         """
-        Opens file stream if not already open.
+        Memory-maps plugin file and opens stream over it
+        if not already open.
         """
 
         if self.plugin_stream is None:
-            self.plugin_stream = open(self.plugin_path, "rb")
+            self.plugin_file = open(self.plugin_path, "rb")
+
+            # Empty files cannot be mapped
+            if self.plugin_path.stat().st_size:
+                self.plugin_map = mmap.mmap(
+                    self.plugin_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                self.plugin_stream = ViewStream(self.plugin_map)
+            else:
+                self.plugin_stream = ViewStream(b"")
 
     def close_stream(self):
         """
-        Closes file stream if opened.
+        Closes stream and file if opened.
         """
 
         if self.plugin_stream:
             self.plugin_stream.close()
             self.plugin_stream = None
 
+        if self.plugin_map:
+            self.plugin_map.close()
+            self.plugin_map = None
+
+        if self.plugin_file:
+            self.plugin_file.close()
+            self.plugin_file = None
+
     def parse_plugin(self):
         """
         Parses raw data and returns parsed
@@ -59,9 +81,10 @@ class PluginParser:
 
         self.open_stream()
 
-        self.parsed_data = Plugin(self.plugin_stream).parse()
-
-        self.close_stream()
+        try:
+            self.parsed_data = Plugin(self.plugin_stream).parse()
+        finally:
+            self.close_stream()
 
         return self.parsed_data
 
@@ -74,6 +97,29 @@ class PluginParser:
         except AttributeError:
             return None
 
+    def extract_record_strings(self, record: Record):
+        """
+        Extracts strings from parsed <record>.
+        """
+
+        strings: list[dict[str, str]] = []
+
+        edid = self.get_record_edid(record)
+        if edid is None:
+            edid = f"[{record.formid}]"
+
+        for subrecord in record.subrecords:
+            if isinstance(subrecord, StringSubrecord):
+                if subrecord.string:
+                    string_data = {
+                        "editor_id": edid,
+                        "type": f"{record.type} {subrecord.type}",
+                        "string": subrecord.string,
+                    }
+                    strings.append(string_data)
+
+        return strings
+
     def extract_group_strings(self, group: Group):
         """
         Extracts strings from parsed <group>.
@@ -85,19 +131,7 @@ class PluginParser:
             if isinstance(record, Group):
                 strings += self.extract_group_strings(record)
             else:
-                edid = self.get_record_edid(record)
-                if edid is None:
-                    edid = f"[{record.formid}]"
-
-                for subrecord in record.subrecords:
-                    if isinstance(subrecord, StringSubrecord):
-                        if subrecord.string:
-                            string_data = {
-                                "editor_id": edid,
-                                "type": f"{record.type} {subrecord.type}",
-                                "string": subrecord.string,
-                            }
-                            strings.append(string_data)
+                strings += self.extract_record_strings(record)
 
         return strings
 
@@ -121,3 +155,20 @@ class PluginParser:
                     strings[group.label] = current_group
 
         return strings
+
+    def iter_strings(self):
+        """
+        Parses plugin lazily and yields strings as soon as
+        their records are decoded. Records are not kept.
+        """
+
+        self.open_stream()
+        records = Plugin(self.plugin_stream).iter_records()
+
+        try:
+            for record in records:
+                yield from self.extract_record_strings(record)
+        finally:
+            # Release all views of the file before closing it
+            records.close()
+            self.close_stream()
@@ -3,12 +3,14 @@ Copyright (c) Cutleast
 """
 
 import os
+import struct
 import zlib
-from io import BufferedReader, BytesIO
+from io import BytesIO
 
-from .datatypes import Flags, Hex, Integer, String
+from .datatypes import Hex, Integer, String
 from .subrecord import SUBRECORD_MAPPING, StringSubrecord, Subrecord
 from .utilities import PARSE_WHITELIST, get_checksum, peek
+from .view_stream import ViewStream
 
 
 class Record:
@@ -16,49 +18,86 @@ class Record:
     Contains parsed record data.
     """
 
-    stream: BufferedReader
+    stream: ViewStream
     type: str = "Record"
 
     subrecords: list[Subrecord] = []
 
-    flag_types = {
-        0x00000080: "Localized",
-        0x00001000: "Ignored",
-        0x00040000: "Compressed",
-        0x00000800: "Initially Disabled",
-        0x00000020: "Deleted",
-    }
-    flags: dict[str, bool] = {}
+    # Type, size, flags, FormID, timestamp,
+    # version control info, internal version, unknown
+    HEADER = struct.Struct("<4sIIiHHHH")
 
-    def __init__(self, stream: BufferedReader):
+    # Record flags
+    DELETED = 0x00000020
+    LOCALIZED = 0x00000080
+    INITIALLY_DISABLED = 0x00000800
+    IGNORED = 0x00001000
+    COMPRESSED = 0x00040000
+
+    flags: int = 0
+
+    def __init__(self, stream: ViewStream):
         self.stream = stream
 
         self.parse()
 
+    @property
+    def is_deleted(self):
+        return bool(self.flags & Record.DELETED)
+
+    @property
+    def is_localized(self):
+        return bool(self.flags & Record.LOCALIZED)
+
+    @property
+    def is_initially_disabled(self):
+        return bool(self.flags & Record.INITIALLY_DISABLED)
+
+    @property
+    def is_ignored(self):
+        return bool(self.flags & Record.IGNORED)
+
+    @property
+    def is_compressed(self):
+        return bool(self.flags & Record.COMPRESSED)
+
     def parse(self):
-        self.type = String.string(self.stream, 4)
-        self.size = Integer.uint32(self.stream)
-        self.flags = Flags.flags(self.stream, 4, self.flag_types)
-        self.formid = Hex.hex(self.stream, 4)
-        self.timestamp = Integer.uint16(self.stream)
-        self.version_control_info = Integer.uint16(self.stream)
-        self.internal_version = Integer.uint16(self.stream)
-        _ = Integer.uint16(self.stream)  # Unknown
-
-        # Decompress data if compressed
-        if self.flags["Compressed"]:
+        (
+            record_type,
+            self.size,
+            self.flags,
+            formid,
+            self.timestamp,
+            self.version_control_info,
+            self.internal_version,
+            _,  # Unknown
+        ) = self.stream.unpack(Record.HEADER)
+        self.type = record_type.decode()
+        self.formid = Hex.format(formid)
+
+        # Skip data without reading it if record is not whitelisted
+        # or if "Ignored" or "Deleted" flag are set
+        if (
+            self.type not in PARSE_WHITELIST
+            or self.flags & (Record.IGNORED | Record.DELETED)
+        ):
+            self.stream.seek(self.size, os.SEEK_CUR)
+            self.subrecords = []
+            return
+
+        # Decompress data if compressed, otherwise
+        # parse subrecords directly from the underlying buffer
+        if self.flags & Record.COMPRESSED:
             self.decompressed_size = Integer.uint32(self.stream)
-            self.data = zlib.decompress(self.stream.read(self.size - 4))
+            with self.stream.substream(self.size - 4) as compressed_stream:
+                subrecord_stream = ViewStream(
+                    zlib.decompress(compressed_stream.view())
+                )
         else:
-            self.data = self.stream.read(self.size)
-
-        # Skip parsing if "Ignored" or "Deleted" flag are set
-        if self.flags["Ignored"] or self.flags["Deleted"]:
-            return
+            subrecord_stream = self.stream.substream(self.size)
 
         # Parse subrecords (also known as fields)
-        subrecord_stream = BytesIO(self.data)
-        if self.type in PARSE_WHITELIST:
+        with subrecord_stream:
             match self.type:
                 case "INFO":
                     self.parse_info_record(subrecord_stream)
@@ -66,10 +105,8 @@ class Record:
                     self.parse_qust_record(subrecord_stream)
                 case _:
                     self.parse_subrecords(subrecord_stream)
-        else:
-            self.subrecords = []
 
-    def parse_qust_record(self, stream: BytesIO):
+    def parse_qust_record(self, stream: ViewStream):
         self.subrecords: list[Subrecord] = []
 
         def get_ctda_hashes():
@@ -135,7 +172,7 @@ class Record:
             if subrecord_type in PARSE_WHITELIST[self.type] or subrecord_type == "EDID":
                 self.subrecords.append(subrecord)
 
-    def parse_info_record(self, stream: BytesIO):
+    def parse_info_record(self, stream: ViewStream):
         self.subrecords: list[Subrecord] = []
 
         current_index = 0
@@ -169,7 +206,7 @@ class Record:
             if subrecord_type in PARSE_WHITELIST[self.type] or subrecord_type == "EDID":
                 self.subrecords.append(subrecord)
 
-    def parse_subrecords(self, stream: BytesIO):
+    def parse_subrecords(self, stream: ViewStream):
         self.subrecords: list[Subrecord] = []
 
         perk_type = None
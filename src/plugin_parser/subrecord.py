@@ -2,6 +2,7 @@
 Copyright (c) Cutleast
 """
 
+import struct
 from io import BufferedReader, BytesIO
 
 from . import utilities as utils
@@ -16,6 +17,9 @@ class Subrecord:
     data_stream: BufferedReader
     type: str = "Subrecord"
 
+    # Type, size
+    HEADER = struct.Struct("<4sH")
+
     def __init__(self, data_stream: BufferedReader, type: str = None):
         self.type = type if type else self.type
         self.data_stream = data_stream
@@ -42,9 +46,12 @@ class Subrecord:
         except AttributeError:
             return 0
 
-    def parse(self, flags: dict[str, bool]):
-        self.type = String.string(self.data_stream, 4)
-        self.size = Integer.uint16(self.data_stream)
+    def parse_header(self):
+        subrecord_type, self.size = self.data_stream.unpack(Subrecord.HEADER)
+        self.type = subrecord_type.decode()
+
+    def parse(self, flags: int):
+        self.parse_header()
         self.data = self.data_stream.read(self.size)
 
 
@@ -55,9 +62,8 @@ class HEDR(Subrecord):
 
     type = "HEDR"
 
-    def parse(self, flags: dict[str, bool]):
-        self.type = String.string(self.data_stream, 4)
-        self.size = Integer.uint16(self.data_stream)
+    def parse(self, flags: int):
+        self.parse_header()
         self.version = round(Float.float32(self.data_stream), 2)
         self.records_num = Integer.uint32(self.data_stream)
         self.next_object_id = Integer.uint32(self.data_stream)
@@ -70,10 +76,11 @@ class EDID(Subrecord):
 
     type = "EDID"
 
-    def parse(self, flags: dict[str, bool]):
-        self.type = String.string(self.data_stream, 4)
-        self.size = Integer.uint16(self.data_stream)
-        self.editor_id = String.zstring(self.data_stream)
+    def parse(self, flags: int):
+        self.parse_header()
+        self.editor_id = (
+            self.data_stream.read(self.size).split(b"\x00", 1)[0].decode()
+        )
 
 
 class StringSubrecord(Subrecord):
@@ -84,15 +91,12 @@ class StringSubrecord(Subrecord):
     type = None
     index: int | None = None
 
-    def parse(self, flags: dict[str, bool]):
-        self.type = String.string(self.data_stream, 4)
-        self.size = Integer.uint16(self.data_stream)
-        self.data = utils.peek(self.data_stream, self.size)
+    def parse(self, flags: int):
+        self.parse_header()
+        self.data = self.data_stream.read(self.size)
 
         try:
-            string = (
-                String.string(self.data_stream, self.size).removesuffix("\x00").strip()
-            )
+            string = self.data.decode().removesuffix("\x00").strip()
             if utils.is_valid_string(string) or string.isnumeric():
                 self.string = string
             else:
@@ -108,7 +112,7 @@ class MAST(Subrecord):
 
     type = "MAST"
 
-    def parse(self, flags: dict[str, bool]):
+    def parse(self, flags: int):
         super().parse(flags)
 
         stream = BytesIO(self.data)
@@ -124,7 +128,7 @@ class TIFC(Subrecord):
 
     type = "TIFC"
 
-    def parse(self, flags: dict[str, bool]):
+    def parse(self, flags: int):
         super().parse(flags)
 
         stream = BytesIO(self.data)
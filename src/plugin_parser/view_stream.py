@@ -0,0 +1,95 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+import struct
+
+
+class ViewStream:
+    """
+    Read-only stream over a buffer, for eg. a memory-mapped file.
+
+    Works like BytesIO, but `substream` returns a stream over a
+    slice of the same buffer without copying it.
+    Streams have to be closed to release the buffer.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._size = len(self._view)
+        self._pos = 0
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads and returns a copy of up to <size> bytes.
+        """
+
+        return self.view(size).tobytes()
+
+    def view(self, size: int = -1) -> memoryview:
+        """
+        Reads and returns up to <size> bytes without copying them.
+        """
+
+        if size is None or size < 0:
+            end = self._size
+        else:
+            end = min(self._pos + size, self._size)
+
+        view = self._view[self._pos : end]
+        self._pos = end
+
+        return view
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        """
+        Reads and unpacks <layout> in one call without copying.
+        """
+
+        values = layout.unpack_from(self._view, self._pos)
+        self._pos += layout.size
+
+        return values
+
+    def substream(self, size: int):
+        """
+        Reads <size> bytes and returns them as new stream
+        without copying them.
+        """
+
+        return ViewStream(self.view(size))
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET):
+        match whence:
+            case os.SEEK_SET:
+                pos = offset
+            case os.SEEK_CUR:
+                pos = self._pos + offset
+            case os.SEEK_END:
+                pos = self._size + offset
+            case _:
+                raise ValueError(f"Invalid whence: {whence}")
+
+        self._pos = max(0, min(pos, self._size))
+
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        """
+        Releases the buffer.
+        """
+
+        self._view.release()
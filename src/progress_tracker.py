@@ -0,0 +1,138 @@
+"""
+This file is part of SEE Lang Detector
+and falls under the license
+GNU General Public License v3.0.
+"""
+
+import threading
+
+
+class FileProgress:
+    """
+    Progress of a single file.
+
+    Workers only set plain values, the UI thread reads them
+    when it drains the tracker.
+    """
+
+    status: str = "Idle..."
+
+    # Shows <value> and <maximum> in the status text if True
+    counting: bool = False
+
+    # Current progress, <maximum> is 0 if the progress is indeterminate
+    value: int = 0
+    maximum: int = 0
+
+    # Result of the file, set once when it is finished
+    finished: bool = False
+    num_text: str = None
+    untranslated: bool = False
+    failed: bool = False
+
+    # Set by the UI thread when the result was displayed
+    displayed: bool = False
+
+    def __init__(self, tracker: "ProgressTracker", file_entry):
+        self.tracker = tracker
+        self.file_entry = file_entry
+
+    def set_status(self, status: str, counting: bool = False):
+        """
+        Sets <status> text. If <counting> is True, the current progress
+        is appended to it when it is displayed.
+        """
+
+        self.status = status
+        self.counting = counting
+        self.tracker.mark_changed(self)
+
+    def set_progress(self, value: int, maximum: int = None):
+        """
+        Sets progress to <value> and optionally <maximum>.
+        """
+
+        if maximum is not None:
+            self.maximum = maximum
+        self.value = value
+        self.tracker.mark_changed(self)
+
+    def finish(
+        self,
+        status: str,
+        num_text: str = None,
+        untranslated: bool = False,
+        failed: bool = False,
+    ):
+        """
+        Sets result of the file.
+        """
+
+        self.status = status
+        self.counting = False
+        self.num_text = num_text
+        self.untranslated = untranslated
+        self.failed = failed
+        self.finished = True
+        self.tracker.mark_changed(self)
+
+    def get_status_text(self):
+        """
+        Returns status text with the progress if counting.
+        """
+
+        if not self.counting:
+            return self.status
+
+        if self.maximum:
+            return f"{self.status} {self.value}/{self.maximum}..."
+
+        return f"{self.status} {self.value}..."
+
+
+class ProgressTracker:
+    """
+    Collects progress of files from worker threads.
+
+    Updating the progress only sets values and marks it as changed,
+    no Qt signal is emitted. The UI thread drains the changes
+    periodically and displays them in one batch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._progress: dict[object, FileProgress] = {}
+        self._changed: set[FileProgress] = set()
+
+    def get(self, file_entry):
+        """
+        Returns progress of <file_entry>.
+        """
+
+        with self._lock:
+            progress = self._progress.get(file_entry)
+
+            if progress is None:
+                progress = FileProgress(self, file_entry)
+                self._progress[file_entry] = progress
+
+        return progress
+
+    def mark_changed(self, progress: FileProgress):
+        """
+        Marks <progress> to be displayed at the next drain.
+        """
+
+        with self._lock:
+            self._changed.add(progress)
+
+    def drain(self):
+        """
+        Returns progress of all files that changed since the last drain.
+        """
+
+        with self._lock:
+            changed = self._changed
+            self._changed = set()
+
+        return list(changed)
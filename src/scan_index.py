@@ -0,0 +1,208 @@
+"""
+This file is part of SEE Lang Detector
+and falls under the license
+GNU General Public License v3.0.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from dictionary import Dictionary
+
+
+class ScanIndex:
+    """
+    Class to manage scan results of previous runs.
+
+    Results are stored per file together with its size,
+    modification time and content hash as well as the
+    scan context (languages, confidence, parser whitelist...)
+    they were made with. Files that did not change since
+    can be restored without scanning them again.
+    """
+
+    index_path = Path("./assets/scan_index.json").resolve()
+    whitelist_path = Path("./assets/parser_whitelist.json").resolve()
+
+    def __init__(self):
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._changed = False
+
+        self.load_index()
+
+    @classmethod
+    def get_context(
+        cls,
+        langs: list,
+        confidence: float,
+        app_version: str,
+        script_backend: str,
+        cascade_margin: float = None,
+    ):
+        """
+        Returns scan context of <langs>, <confidence>, the parser whitelist,
+        <app_version>, <script_backend> and <cascade_margin>.
+        Results are only restored for the same context.
+        """
+
+        whitelist_hash = hashlib.blake2b(
+            cls.whitelist_path.read_bytes(), digest_size=8
+        ).hexdigest()
+        lang_names = ",".join(lang.name for lang in langs)
+
+        return (
+            f"{lang_names}|{confidence}|{whitelist_hash}|{app_version}|{script_backend}"
+            f"|{cascade_margin}"
+        )
+
+    @staticmethod
+    def get_content_hash(file_entry):
+        """
+        Returns hash of the content of <file_entry>.
+        """
+
+        content_hash = hashlib.blake2b(digest_size=16)
+
+        # Files in archives are hashed without the rest of the archive
+        if file_entry.archive_member is not None:
+            content_hash.update(file_entry.read_bytes())
+        else:
+            with open(file_entry.file_path, "rb") as file:
+                while chunk := file.read(1024 * 1024):
+                    content_hash.update(chunk)
+
+        return content_hash.hexdigest()
+
+    @staticmethod
+    def get_size_and_mtime(file_entry):
+        """
+        Returns size and modification time of <file_entry>.
+        Files in archives have the modification time of their archive.
+        """
+
+        stat = file_entry.source_path.stat()
+
+        if file_entry.archive_member is not None:
+            return file_entry.archive_member.size, stat.st_mtime_ns
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def restore(self, file_entry, context: str, dictionary: Dictionary):
+        """
+        Restores number of strings and untranslated strings of
+        <file_entry> if it did not change since it was stored
+        in <context>. Returns True if it was restored.
+        """
+
+        key = str(file_entry.file_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None or entry["context"] != context:
+            return False
+
+        try:
+            size, mtime = self.get_size_and_mtime(file_entry)
+        except OSError:
+            return False
+
+        if size != entry["size"]:
+            return False
+
+        # Modification time changed, for eg. for files in repacked BSAs
+        if mtime != entry["mtime"]:
+            if entry["hash"] is None:
+                return False
+
+            if self.get_content_hash(file_entry) != entry["hash"]:
+                return False
+
+            with self._lock:
+                entry["mtime"] = mtime
+                self._changed = True
+
+        untranslated_strings: list[dict[str, str]] = entry["untranslated_strings"]
+
+        # Strings can only be added to the dictionary,
+        # so results of older revisions just need to be filtered again
+        if entry["dictionary_revision"] != dictionary.revision:
+            untranslated_strings = [
+                string
+                for string in untranslated_strings
+                if not (
+                    dictionary.has_edid(string["editor_id"])
+                    or dictionary.has_string(string["string"])
+                )
+            ]
+
+        file_entry.strings = None
+        file_entry.string_count = entry["string_count"]
+        file_entry.untranslated_strings = untranslated_strings
+
+        return True
+
+    def store(self, file_entry, context: str, dictionary: Dictionary):
+        """
+        Stores number of strings and untranslated strings of
+        <file_entry> in <context>.
+
+        The content is only hashed if it is already in memory,
+        for eg. for files in archives that were read in bulk.
+        Other files are scanned again if their modification time changes.
+        """
+
+        try:
+            size, mtime = self.get_size_and_mtime(file_entry)
+        except OSError:
+            return
+
+        if file_entry.content is not None:
+            content_hash = self.get_content_hash(file_entry)
+        else:
+            content_hash = None
+
+        entry = {
+            "size": size,
+            "mtime": mtime,
+            "hash": content_hash,
+            "context": context,
+            "dictionary_revision": dictionary.revision,
+            "string_count": file_entry.string_count,
+            "untranslated_strings": file_entry.untranslated_strings,
+        }
+
+        with self._lock:
+            self._entries[str(file_entry.file_path)] = entry
+            self._changed = True
+
+    def save_index(self):
+        """
+        Saves index to JSON file if it changed.
+        """
+
+        if not self._changed:
+            return
+
+        with self._lock:
+            with open(self.index_path, "w", encoding="utf8") as file:
+                json.dump(self._entries, file, ensure_ascii=False)
+
+            self._changed = False
+
+    def load_index(self):
+        """
+        Loads index from JSON file.
+        """
+
+        if not self.index_path.is_file():
+            return
+
+        try:
+            with open(self.index_path, "r", encoding="utf8") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError):
+            self._entries = {}
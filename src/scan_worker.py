@@ -0,0 +1,187 @@
+"""
+This file is part of SEE Lang Detector
+and falls under the license
+GNU General Public License v3.0.
+"""
+
+from multiprocessing import Queue
+from pathlib import Path
+
+from archive_parser.archive_member import ArchiveMember
+from detection_cache import DetectionCache
+from detector import LangDetector, Language
+from dictionary import Dictionary
+from file_entry import FileEntry
+from mcm_file import MCMEntry
+from plugin import PluginEntry
+from script_entry import ScriptEntry
+
+ENTRY_TYPES: dict[str, type[FileEntry]] = {
+    "PluginEntry": PluginEntry,
+    "MCMEntry": MCMEntry,
+    "ScriptEntry": ScriptEntry,
+}
+
+
+class ProgressProxy:
+    """
+    Stands in for the progress of a file in a worker process
+    and forwards updates to the progress queue.
+    The main process passes them to the progress tracker.
+    """
+
+    def __init__(self, queue: Queue, index: int):
+        self.queue = queue
+        self.index = index
+
+    def set_status(self, status: str, counting: bool = False):
+        self.queue.put((self.index, "set_status", (status, counting)))
+
+    def set_progress(self, value: int, maximum: int = None):
+        self.queue.put((self.index, "set_progress", (value, maximum)))
+
+
+class ScanWorker:
+    """
+    Scans files in a process of the process pool scan mode.
+    """
+
+    def __init__(
+        self,
+        lang_names: list[str],
+        desired_lang_name: str,
+        edids: list[str],
+        strings: list[str],
+        cache_entries: list[tuple[str, str, str | None]],
+        chunk_size: int,
+        script_backend: str,
+        cascade_margin: float,
+        progress_queue: Queue,
+    ):
+        self.desired_lang = getattr(Language, desired_lang_name)
+        self.progress_queue = progress_queue
+
+        ScriptEntry.backend = script_backend
+        LangDetector.cascade_margin = cascade_margin
+
+        dictionary = Dictionary(load=False)
+        dictionary.add_many(edids, strings)
+
+        self.cache = DetectionCache(load=False)
+        self.cache.add_entries(cache_entries)
+        self.cache.track_new_entries = True
+
+        self.lang_detector = LangDetector(
+            chunk_size=chunk_size, dictionary=dictionary, cache=self.cache
+        )
+        self.lang_detector.set_langs([getattr(Language, name) for name in lang_names])
+
+    def scan_file(
+        self,
+        index: int,
+        entry_type: str,
+        file_path: Path,
+        archive_member: ArchiveMember = None,
+    ):
+        """
+        Extracts strings from file and scans them for untranslated strings.
+
+        Returns index, number of strings, untranslated strings,
+        new detection cache entries and hits of the detection tiers.
+        """
+
+        progress = ProgressProxy(self.progress_queue, index)
+
+        progress.set_progress(0, 0)
+        progress.set_status("Extracting strings...")
+
+        # Strings are extracted while the detector consumes them
+        file_entry = ENTRY_TYPES[entry_type](
+            app=None, file=file_path, archive_member=archive_member
+        )
+        untranslated_strings = self.lang_detector.clean_target_lang_strings(
+            file_entry.iter_strings(), self.desired_lang, progress
+        )
+
+        # Only the untranslated strings are sent back to the main process
+        return (
+            index,
+            len(file_entry.strings),
+            untranslated_strings,
+            self.cache.pop_new_entries(),
+            self.lang_detector.pop_tier_hits(),
+        )
+
+    def triage_file(
+        self,
+        index: int,
+        entry_type: str,
+        file_path: Path,
+        archive_member: ArchiveMember = None,
+    ):
+        """
+        Extracts strings from file and samples them until it is
+        decided whether the file is translated.
+
+        Returns index, triage result, new detection cache entries
+        and hits of the detection tiers.
+        """
+
+        progress = ProgressProxy(self.progress_queue, index)
+
+        progress.set_progress(0, 0)
+        progress.set_status("Extracting strings...")
+
+        file_entry = ENTRY_TYPES[entry_type](
+            app=None, file=file_path, archive_member=archive_member
+        )
+        strings = file_entry.extract_strings()
+
+        progress.set_status("Triaging...")
+        result = self.lang_detector.triage(strings, self.desired_lang, progress)
+
+        return (
+            index,
+            result,
+            self.cache.pop_new_entries(),
+            self.lang_detector.pop_tier_hits(),
+        )
+
+
+_worker: ScanWorker = None
+
+
+def init_worker(*args):
+    """
+    Initializes worker of current process. Called once per process.
+    """
+
+    global _worker
+
+    _worker = ScanWorker(*args)
+
+
+def scan_file(
+    index: int,
+    entry_type: str,
+    file_path: Path,
+    archive_member: ArchiveMember = None,
+):
+    """
+    Scans file with worker of current process.
+    """
+
+    return _worker.scan_file(index, entry_type, file_path, archive_member)
+
+
+def triage_file(
+    index: int,
+    entry_type: str,
+    file_path: Path,
+    archive_member: ArchiveMember = None,
+):
+    """
+    Triages file with worker of current process.
+    """
+
+    return _worker.triage_file(index, entry_type, file_path, archive_member)
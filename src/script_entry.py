@@ -5,10 +5,15 @@ GNU General Public License v3.0.
 """
 
 from file_entry import FileEntry
+import logging
+import shutil
 import subprocess
 from pathlib import Path
 import os
 
+from script_parser.script_parser import ScriptParser
+from script_parser.string_scanner import StringScanner
+
 
 with open("./assets/psc_blacklist.txt", "r", encoding="utf8") as file:
     PSC_BLACKLIST = [
@@ -17,6 +22,9 @@ with open("./assets/psc_blacklist.txt", "r", encoding="utf8") as file:
         if not line.startswith("#") and line.strip()
     ]
 
+# Names of functions whose string arguments are not translatable
+CALL_BLACKLIST = {name.strip().lower() for name in PSC_BLACKLIST}
+
 STRING_BLACKLIST = [
     "{0}"
 ]
@@ -29,6 +37,16 @@ class ScriptEntry(FileEntry):
 
     decompiler_path = Path('./assets/champollion/Champollion.exe').resolve()
 
+    # Backend used to extract strings
+    BACKENDS = ["Native", "Champollion"]
+    backend: str = BACKENDS[0]
+
+    # Maximum number of scripts decompiled with one Champollion call
+    batch_size: int = 250
+
+    # Set if script was decompiled in a batch
+    psc_path: Path = None
+
     def _exec_command(self, args: str):
         cmd = f""""{self.decompiler_path}" {args}"""
 
@@ -51,17 +69,70 @@ class ScriptEntry(FileEntry):
         self.pid = None
 
         if process.returncode:
-            self.app.log.error(f"Champollion Command:\n{cmd}")
-            self.app.log.error(f"Champollion Output:\n{output}")
+            log = self.app.log if self.app else logging.getLogger("ScriptEntry")
+            log.error(f"Champollion Command:\n{cmd}")
+            log.error(f"Champollion Output:\n{output}")
             raise RuntimeError("Failed to execute Champollion command! Check output above!")
 
+    @staticmethod
+    def get_batches(entries: list["ScriptEntry"], batch_size: int):
+        """
+        Splits <entries> into batches of up to <batch_size> scripts
+        with unique file names.
+        """
+
+        batches: list[tuple[list[ScriptEntry], set[str]]] = []
+
+        for entry in entries:
+            name = entry.file_path.name.lower()
+
+            for batch, names in batches:
+                if len(batch) < batch_size and name not in names:
+                    batch.append(entry)
+                    names.add(name)
+                    break
+            else:
+                batches.append(([entry], {name}))
+
+        return [batch for batch, _ in batches]
+
+    @staticmethod
+    def decompile_batch(entries: list["ScriptEntry"], batch_folder: Path):
+        """
+        Decompiles <entries> with a single Champollion call
+        to <batch_folder>. File names of <entries> must be unique.
+        """
+
+        pex_folder = batch_folder / "pex"
+        psc_folder = batch_folder / "psc"
+        os.makedirs(pex_folder, exist_ok=True)
+        os.makedirs(psc_folder, exist_ok=True)
+
+        for entry in entries:
+            pex_path = pex_folder / entry.file_path.name
+
+            if entry.archive_member is not None:
+                pex_path.write_bytes(entry.read_bytes())
+            else:
+                shutil.copyfile(entry.file_path, pex_path)
+
+        args = f""""{pex_folder}" --psc "{psc_folder}" """
+        entries[0]._exec_command(args)
+
+        for entry in entries:
+            psc_path = (psc_folder / entry.file_path.name).with_suffix(".psc")
+
+            if psc_path.is_file():
+                entry.psc_path = psc_path
+
     def decompile_script(self):
         """
         Decompiles script to better extract strings.
         """
 
-        if not self.file_path.is_file():
-            raise FileNotFoundError(f"PEX File '{self.file_path}' does not exist!")
+        # Already decompiled in a batch
+        if self.psc_path is not None and self.psc_path.is_file():
+            return self.psc_path
 
         out_path = (Path("temp") / self.file_path.name).resolve().with_suffix(".psc")
 
@@ -70,7 +141,16 @@ class ScriptEntry(FileEntry):
         if out_path.is_file():
             os.remove(out_path)
 
-        args = f""""{self.file_path}" --psc "{out_path.parent}" """
+        # Champollion can only read scripts from disk
+        if self.archive_member is not None:
+            pex_path = out_path.with_suffix(".pex")
+            pex_path.write_bytes(self.read_bytes())
+        elif self.file_path.is_file():
+            pex_path = self.file_path
+        else:
+            raise FileNotFoundError(f"PEX File '{self.file_path}' does not exist!")
+
+        args = f""""{pex_path}" --psc "{out_path.parent}" """
         self._exec_command(args)
 
         return out_path
@@ -109,6 +189,56 @@ class ScriptEntry(FileEntry):
         Extracts strings from compiled script file.
         """
 
+        if self.backend == "Champollion":
+            result = self.extract_strings_champollion()
+        else:
+            result = self.extract_strings_native()
+
+        self.strings = result
+        return result
+
+    def extract_strings_native(self):
+        """
+        Extracts string literals directly from the bytecode
+        of the compiled script without decompiling it.
+        """
+
+        script_data = self.read_bytes()
+
+        # Quick first pass to skip scripts without any string literals
+        literals = StringScanner(script_data).scan().get_literals()
+        if all(literal in STRING_BLACKLIST for literal in literals):
+            return []
+
+        script = ScriptParser(script_data=script_data).parse_script()
+
+        result: list[dict[str, str]] = []
+
+        for string, instruction in script.iter_string_literals():
+            if not string or string in STRING_BLACKLIST:
+                continue
+
+            # Skip arguments of functions that take non-translatable strings
+            if (
+                instruction is not None
+                and isinstance(instruction.function_name, str)
+                and instruction.function_name.lower() in CALL_BLACKLIST
+            ):
+                continue
+
+            result.append({
+                "editor_id": "",
+                "type": "PEX",
+                "string": string
+            })
+
+        return result
+
+    def extract_strings_champollion(self):
+        """
+        Extracts strings from script decompiled with Champollion.
+        """
+
         psc_file = self.decompile_script()
 
         result: list[dict[str, str]] = []
@@ -131,5 +261,4 @@ class ScriptEntry(FileEntry):
                             "string": string
                         })
 
-        self.strings = result
         return result
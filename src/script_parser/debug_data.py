@@ -15,7 +15,6 @@ class DebugInfo(Datatype):
 
     def __init__(self, stream: BufferedReader, string_table: StringTable):
         self.has_debug_info = bool(uint8(stream))
-        print(self.has_debug_info)
 
         if self.has_debug_info:
             self.modification_time = uint64(stream)
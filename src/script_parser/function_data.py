@@ -0,0 +1,142 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from io import BufferedReader
+
+from .datatypes import Datatype
+from .integer_types import *
+from .string_data import StringTable
+from .variable_data import VariableData
+
+
+class Function(Datatype):
+    """
+    Used to parse functions.
+    """
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        return_type_index = uint16(stream)
+        self.return_type = string_table.get_string(return_type_index)
+
+        docstring_index = uint16(stream)
+        self.docstring = string_table.get_string(docstring_index)
+
+        self.user_flags = uint32(stream)
+        self.flags = uint8(stream)
+
+        self.param_count = uint16(stream)
+        self.params = [
+            VariableType(stream, string_table) for i in range(self.param_count)
+        ]
+
+        self.local_count = uint16(stream)
+        self.locals = [
+            VariableType(stream, string_table) for i in range(self.local_count)
+        ]
+
+        self.instruction_count = uint16(stream)
+        self.instructions = [
+            Instruction(stream, string_table) for i in range(self.instruction_count)
+        ]
+
+
+class NamedFunction(Datatype):
+    """
+    Used to parse functions of states.
+    """
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        name_index = uint16(stream)
+        self.name = string_table.get_string(name_index)
+
+        self.function = Function(stream, string_table)
+
+
+class VariableType(Datatype):
+    """
+    Used to parse names and types of parameters and local variables.
+    """
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        name_index = uint16(stream)
+        self.name = string_table.get_string(name_index)
+
+        type_index = uint16(stream)
+        self.type_name = string_table.get_string(type_index)
+
+
+class Instruction(Datatype):
+    """
+    Used to parse instructions of functions.
+    """
+
+    # Opcode -> (name, number of fixed arguments)
+    OPCODES = {
+        0x00: ("nop", 0),
+        0x01: ("iadd", 3),
+        0x02: ("fadd", 3),
+        0x03: ("isub", 3),
+        0x04: ("fsub", 3),
+        0x05: ("imul", 3),
+        0x06: ("fmul", 3),
+        0x07: ("idiv", 3),
+        0x08: ("fdiv", 3),
+        0x09: ("imod", 3),
+        0x0A: ("not", 2),
+        0x0B: ("ineg", 2),
+        0x0C: ("fneg", 2),
+        0x0D: ("assign", 2),
+        0x0E: ("cast", 2),
+        0x0F: ("cmp_eq", 3),
+        0x10: ("cmp_lt", 3),
+        0x11: ("cmp_le", 3),
+        0x12: ("cmp_gt", 3),
+        0x13: ("cmp_ge", 3),
+        0x14: ("jmp", 1),
+        0x15: ("jmpt", 2),
+        0x16: ("jmpf", 2),
+        0x17: ("callmethod", 3),
+        0x18: ("callparent", 2),
+        0x19: ("callstatic", 3),
+        0x1A: ("return", 1),
+        0x1B: ("strcat", 3),
+        0x1C: ("propget", 3),
+        0x1D: ("propset", 3),
+        0x1E: ("array_create", 2),
+        0x1F: ("array_length", 2),
+        0x20: ("array_getelement", 3),
+        0x21: ("array_setelement", 3),
+        0x22: ("array_findelement", 4),
+        0x23: ("array_rfindelement", 4),
+    }
+
+    # Call opcode -> index of function name argument
+    CALL_OPCODES = {
+        0x17: 0,  # callmethod
+        0x18: 0,  # callparent
+        0x19: 1,  # callstatic
+    }
+
+    function_name: str = None
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        self.opcode = uint8(stream)
+
+        if self.opcode not in self.OPCODES:
+            raise ValueError(f"Unknown opcode: {self.opcode:#04x}")
+
+        self.op, arg_count = self.OPCODES[self.opcode]
+
+        self.arguments = [
+            VariableData(stream, string_table) for i in range(arg_count)
+        ]
+
+        # Calls have a variable number of additional arguments
+        if self.opcode in self.CALL_OPCODES:
+            self.function_name = self.arguments[self.CALL_OPCODES[self.opcode]].data
+
+            vararg_count = VariableData(stream, string_table).data
+            self.arguments += [
+                VariableData(stream, string_table) for i in range(vararg_count)
+            ]
@@ -42,8 +42,8 @@ def uint64(stream: BufferedReader):
 
 
 def float32(stream: BufferedReader):
-    return struct.unpack("f", stream.read(4))[0]
+    return struct.unpack(">f", stream.read(4))[0]
 
 def float64(stream: BufferedReader):
-    return struct.unpack("f", stream.read(8))[0]
+    return struct.unpack(">d", stream.read(8))[0]
 
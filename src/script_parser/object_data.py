@@ -6,8 +6,10 @@ from io import BufferedReader
 
 from .datatypes import Datatype
 from .integer_types import *
-from .variable_data import Variables
+from .property_data import Property
+from .state_data import State
 from .string_data import StringTable
+from .variable_data import Variables
 
 
 class Objects(Datatype):
@@ -18,9 +20,7 @@ class Objects(Datatype):
     def __init__(self, stream: BufferedReader, string_table: StringTable):
         self.object_count = uint16(stream)
         self.objects = [
-            str(_object)
-            for i in range(self.object_count)
-            if (_object := Object(stream, string_table))
+            Object(stream, string_table) for i in range(self.object_count)
         ]
 
 
@@ -55,3 +55,13 @@ class ObjectData(Datatype):
         self.auto_state_name = string_table.get_string(state_name_index)
 
         self.variables = Variables(stream, string_table)
+
+        self.property_count = uint16(stream)
+        self.properties = [
+            Property(stream, string_table) for i in range(self.property_count)
+        ]
+
+        self.state_count = uint16(stream)
+        self.states = [
+            State(stream, string_table) for i in range(self.state_count)
+        ]
@@ -0,0 +1,48 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from io import BufferedReader
+
+from .datatypes import Datatype
+from .function_data import Function
+from .integer_types import *
+from .string_data import StringTable
+
+
+class Property(Datatype):
+    """
+    Used to parse properties.
+    """
+
+    # Property flags
+    READ = 0x1
+    WRITE = 0x2
+    AUTOVAR = 0x4
+
+    auto_var_name: str = None
+    read_handler: Function = None
+    write_handler: Function = None
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        name_index = uint16(stream)
+        self.name = string_table.get_string(name_index)
+
+        type_index = uint16(stream)
+        self.type_name = string_table.get_string(type_index)
+
+        docstring_index = uint16(stream)
+        self.docstring = string_table.get_string(docstring_index)
+
+        self.user_flags = uint32(stream)
+        self.flags = uint8(stream)
+
+        if self.flags & self.AUTOVAR:
+            auto_var_index = uint16(stream)
+            self.auto_var_name = string_table.get_string(auto_var_index)
+        else:
+            if self.flags & self.READ:
+                self.read_handler = Function(stream, string_table)
+
+            if self.flags & self.WRITE:
+                self.write_handler = Function(stream, string_table)
@@ -37,6 +37,11 @@ class Script(Datatype):
 
     def parse(self):
         self.magic = self.data_stream.read(4).hex().upper()
+
+        # Fallout 4 scripts are little endian and start with "DEC057FA"
+        if self.magic != "FA57C0DE":
+            raise ValueError(f"Unsupported script magic: {self.magic}")
+
         self.major_version = uint8(self.data_stream)
         self.minor_version = uint8(self.data_stream)
         self.game_id = uint16(self.data_stream)
@@ -52,9 +57,42 @@ class Script(Datatype):
         # UserFlags(self.data_stream)
         self.objects = Objects(self.data_stream, self.string_table)
 
-        self.string_table.clean_used_strings()
-
         return self
 
+    def iter_functions(self):
+        """
+        Yields all functions of all objects, including
+        property handlers and functions of states.
+        """
+
+        for _object in self.objects.objects:
+            for _property in _object.data.properties:
+                if _property.read_handler is not None:
+                    yield _property.read_handler
+
+                if _property.write_handler is not None:
+                    yield _property.write_handler
+
+            for state in _object.data.states:
+                for named_function in state.functions:
+                    yield named_function.function
+
+    def iter_string_literals(self):
+        """
+        Yields string literals as (string, instruction) tuples.
+        Instruction is None for initial values of variables.
+        """
+
+        for _object in self.objects.objects:
+            for variable in _object.data.variables.variables:
+                if variable.data.type == "string":
+                    yield variable.data.data, None
+
+        for function in self.iter_functions():
+            for instruction in function.instructions:
+                for argument in instruction.arguments:
+                    if argument.type == "string":
+                        yield argument.data, instruction
+
 
 
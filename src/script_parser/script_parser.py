@@ -2,7 +2,7 @@
 Copyright (c) Cutleast
 """
 
-from io import BufferedReader
+from io import BufferedReader, BytesIO
 from pathlib import Path
 from .script import Script
 
@@ -14,19 +14,25 @@ class ScriptParser:
     """
 
     script_path: Path = None
+    script_data: bytes = None
     script_stream: BufferedReader = None
     parsed_data = None
 
-    def __init__(self, script_path: Path):
+    def __init__(self, script_path: Path = None, script_data: bytes = None):
         self.script_path = script_path
-    
+        self.script_data = script_data
+
     def open_stream(self):
         """
         Opens file stream if not already open.
+        Scripts are read at once since they are small.
         """
 
         if self.script_stream is None:
-            self.script_stream = open(self.script_path, "rb")
+            if self.script_data is None:
+                self.script_data = self.script_path.read_bytes()
+
+            self.script_stream = BytesIO(self.script_data)
 
     def close_stream(self):
         """
@@ -0,0 +1,25 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from io import BufferedReader
+
+from .datatypes import Datatype
+from .function_data import NamedFunction
+from .integer_types import *
+from .string_data import StringTable
+
+
+class State(Datatype):
+    """
+    Used to parse states.
+    """
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable):
+        name_index = uint16(stream)
+        self.name = string_table.get_string(name_index)
+
+        self.function_count = uint16(stream)
+        self.functions = [
+            NamedFunction(stream, string_table) for i in range(self.function_count)
+        ]
@@ -15,13 +15,8 @@ class StringTable(Datatype):
     def __init__(self, stream: BufferedReader):
         self.count = uint16(stream)
 
-        self.strings = [
-            string
-            for i in range(self.count)
-            if (string := wstring(stream))
-        ]
-
-        self.used_strings: list[str] = []
+        # Empty strings are kept since strings are referenced by index
+        self.strings = [wstring(stream) for i in range(self.count)]
 
     def get_string(self, index: int):
         """
@@ -30,22 +25,23 @@ class StringTable(Datatype):
         """
 
         if 0 <= index < self.count:
-            string = self.strings[index]
-            
-            if string not in self.used_strings:
-                self.used_strings.append(string)
-
-            return string
+            return self.strings[index]
         else:
             return index
 
-    def clean_used_strings(self):
-        for string in self.used_strings:
-            self.strings.remove(string)
 
-        self.strings.sort()
+def decode_string(data: bytes):
+    """
+    Decodes <data> as UTF-8 or as cp1252 if it is not valid UTF-8.
+    Strings of older scripts are often encoded in a legacy code page.
+    """
+
+    try:
+        return data.decode()
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
 
 
 def wstring(stream: BufferedReader):
-    return stream.read(uint16(stream)).decode()
+    return decode_string(stream.read(uint16(stream)))
 
@@ -0,0 +1,90 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import struct
+
+from .string_data import decode_string
+
+
+class StringScanner:
+    """
+    Class for quickly scanning compiled papyrus scripts for strings.
+
+    Only the header and the string table are parsed, without building
+    objects, functions or instructions. String literals are always
+    stored as a string operand (type byte 0x02 followed by the index),
+    so every string whose index never follows a 0x02 byte is an
+    identifier. The remaining strings are a superset of the literals.
+    """
+
+    MAGIC = b"\xFA\x57\xC0\xDE"
+
+    # Magic, major version, minor version, game id, compilation time
+    HEADER = struct.Struct(">4sBBHQ")
+
+    # Type byte of string operands
+    STRING_TYPE = 0x02
+
+    strings: list[bytes] = None
+    literal_indices: set[int] = None
+    identifier_indices: set[int] = None
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    @staticmethod
+    def read_wstring(data: memoryview, pos: int):
+        """
+        Returns string at <pos> and position after it.
+        """
+
+        length = int.from_bytes(data[pos : pos + 2], "big")
+        pos += 2
+
+        return data[pos : pos + length].tobytes(), pos + length
+
+    def scan(self):
+        data = memoryview(self.data)
+
+        if self.HEADER.unpack_from(data)[0] != self.MAGIC:
+            raise ValueError("Not a compiled Skyrim papyrus script!")
+
+        pos = self.HEADER.size
+
+        # Source file name, user name, machine name
+        for _ in range(3):
+            _, pos = self.read_wstring(data, pos)
+
+        count = int.from_bytes(data[pos : pos + 2], "big")
+        pos += 2
+
+        self.strings = []
+        for _ in range(count):
+            string, pos = self.read_wstring(data, pos)
+            self.strings.append(string)
+
+        # Collect indices that follow a string type byte
+        candidates: set[int] = set()
+        body = self.data[pos:]
+        index = body.find(self.STRING_TYPE)
+        while index != -1:
+            candidates.add(int.from_bytes(body[index + 1 : index + 3], "big"))
+            index = body.find(self.STRING_TYPE, index + 1)
+
+        self.literal_indices = {
+            index for index in candidates if index < count and self.strings[index]
+        }
+        self.identifier_indices = set(range(count)) - self.literal_indices
+
+        return self
+
+    def get_literals(self):
+        """
+        Returns strings that may be used as string literals.
+        """
+
+        return [
+            decode_string(self.strings[index])
+            for index in sorted(self.literal_indices)
+        ]
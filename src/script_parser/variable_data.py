@@ -18,9 +18,7 @@ class Variables(Datatype):
         self.variable_count = uint16(stream)
 
         self.variables = [
-            str(variable)
-            for i in range(self.variable_count)
-            if (variable := Variable(stream, string_table))
+            Variable(stream, string_table) for i in range(self.variable_count)
         ]
 
 
@@ -38,7 +36,7 @@ class Variable(Datatype):
 
         self.user_flags = uint32(stream)
 
-        self.data = VariableData(stream)
+        self.data = VariableData(stream, string_table)
 
 
 class VariableData(Datatype):
@@ -46,21 +44,26 @@ class VariableData(Datatype):
     Used to parsed variable data.
     """
 
-    def __init__(self, stream: BufferedReader):
-        TYPES = {
-            0: "null",
-            1: "identifier",
-            2: "string",
-            3: "integer",
-            4: "float",
-            5: "bool"
-        }
-        
-        self.type = TYPES.get(uint8(stream), "")
+    TYPES = {
+        0: "null",
+        1: "identifier",
+        2: "string",
+        3: "integer",
+        4: "float",
+        5: "bool"
+    }
+
+    data = None
+
+    def __init__(self, stream: BufferedReader, string_table: StringTable = None):
+        self.type = self.TYPES.get(uint8(stream), "")
 
         match self.type:
-            case "identifier", "string":
+            case "identifier" | "string":
                 self.data = uint16(stream)
+
+                if string_table is not None:
+                    self.data = string_table.get_string(self.data)
             case "integer":
                 self.data = int32(stream)
             case "float":
@@ -208,6 +208,8 @@ class StringPreview(qtw.QDialog):
                 )
             )
 
+        new_strings: list[str] = []
+
         for item_row in current_item_rows:
             string_type, edid, string = item_row
             if not edid.text():
@@ -218,11 +220,13 @@ class StringPreview(qtw.QDialog):
                 {"type": string_type.text(), "editor_id": edid, "string": string.text()}
             )
             self.file.set_num_sign.emit(
-                f"{len(self.file.untranslated_strings)}/{len(self.file.strings)}"
+                f"{len(self.file.untranslated_strings)}/{self.file.string_count}"
             )
-            self.app.dict.add_string(string.text())
+            new_strings.append(string.text())
             self.strings_model.removeRow(item_row[0].row())
 
+        self.app.dict.add_many(strings=new_strings)
+
         if current_item_rows and not self.file.untranslated_strings:
             self.app.untranslated_num -= 1
             self.app.untranslated_num_label.setText(
@@ -253,6 +257,8 @@ class StringPreview(qtw.QDialog):
                 )
             )
 
+        new_edids: list[str] = []
+
         for item_row in current_item_rows:
             string_type, edid, string = item_row
             if not edid.text():
@@ -265,11 +271,13 @@ class StringPreview(qtw.QDialog):
                 }
             )
             self.file.set_num_sign.emit(
-                f"{len(self.file.untranslated_strings)}/{len(self.file.strings)}"
+                f"{len(self.file.untranslated_strings)}/{self.file.string_count}"
             )
-            self.app.dict.add_edid(edid.text())
+            new_edids.append(edid.text())
             self.strings_model.removeRow(item_row[0].row())
 
+        self.app.dict.add_many(edids=new_edids)
+
         if current_item_rows and not self.file.untranslated_strings:
             self.app.untranslated_num -= 1
             self.app.untranslated_num_label.setText(
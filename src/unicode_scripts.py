@@ -0,0 +1,135 @@
+"""
+This file is part of SEE Lang Detector
+and falls under the license
+GNU General Public License v3.0.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+LATIN = "Latin"
+CYRILLIC = "Cyrillic"
+HAN = "Han"
+KANA = "Kana"
+HANGUL = "Hangul"
+OTHER = "Other"
+
+# Scripts of languages that are not written in Latin script, by language name
+LANGUAGE_SCRIPTS: dict[str, frozenset[str]] = {
+    **{
+        name: frozenset([CYRILLIC])
+        for name in [
+            "BELARUSIAN",
+            "BULGARIAN",
+            "KAZAKH",
+            "MACEDONIAN",
+            "MONGOLIAN",
+            "RUSSIAN",
+            "SERBIAN",
+            "UKRAINIAN",
+        ]
+    },
+    "CHINESE": frozenset([HAN]),
+    "JAPANESE": frozenset([HAN, KANA]),
+    "KOREAN": frozenset([HANGUL, HAN]),
+    **{
+        name: frozenset([OTHER])
+        for name in [
+            "ARABIC",
+            "ARMENIAN",
+            "BENGALI",
+            "GEORGIAN",
+            "GREEK",
+            "GUJARATI",
+            "HEBREW",
+            "HINDI",
+            "MARATHI",
+            "PERSIAN",
+            "PUNJABI",
+            "TAMIL",
+            "TELUGU",
+            "THAI",
+            "URDU",
+        ]
+    },
+}
+
+# Format placeholders like <Alias=Player>, %s, %1$d or {0}
+PLACEHOLDER_PATTERN = re.compile(
+    r"<[^<>]*>|%(?:\d+\$)?[-+ #0]*\d*(?:\.\d+)?[a-zA-Z%]|\{[^{}]*\}"
+)
+
+
+def get_language_scripts(lang_name: str):
+    """
+    Returns scripts that language with <lang_name> is written in.
+    """
+
+    return LANGUAGE_SCRIPTS.get(lang_name, frozenset([LATIN]))
+
+
+@lru_cache(maxsize=4096)
+def get_script(char: str):
+    """
+    Returns script of letter <char>.
+    """
+
+    code = ord(char)
+
+    if code < 0x250 or 0x1E00 <= code <= 0x1EFF:
+        return LATIN
+    elif 0x400 <= code <= 0x52F or 0x1C80 <= code <= 0x1C8F:
+        return CYRILLIC
+    elif (
+        0xAC00 <= code <= 0xD7AF
+        or 0x1100 <= code <= 0x11FF
+        or 0x3130 <= code <= 0x318F
+    ):
+        return HANGUL
+    elif (
+        0x3040 <= code <= 0x30FF
+        or 0x31F0 <= code <= 0x31FF
+        or 0xFF66 <= code <= 0xFF9F
+    ):
+        return KANA
+    elif (
+        0x4E00 <= code <= 0x9FFF
+        or 0x3400 <= code <= 0x4DBF
+        or 0xF900 <= code <= 0xFAFF
+        or 0x20000 <= code <= 0x2FA1F
+    ):
+        return HAN
+
+    return OTHER
+
+
+def strip_placeholders(string: str):
+    """
+    Returns <string> without format placeholders.
+    """
+
+    return PLACEHOLDER_PATTERN.sub("", string)
+
+
+def get_dominant_script(string: str):
+    """
+    Returns dominant script of the letters in <string>
+    and the share of letters that are in it.
+    Returns None and 0 if <string> has no letters.
+    """
+
+    # Fast path for the most common case
+    if string.isascii():
+        if any(char.isalpha() for char in string):
+            return LATIN, 1.0
+
+        return None, 0.0
+
+    scripts = Counter(get_script(char) for char in string if char.isalpha())
+    if not scripts:
+        return None, 0.0
+
+    script, count = scripts.most_common(1)[0]
+
+    return script, count / scripts.total()
@@ -32,7 +32,7 @@ class Updater(qtc.QObject):
         self.app = app
         self.installed_version = semver.Version(self.app.version)
         self.log = logging.getLogger(self.__repr__())
-        self.log.addHandler(app.log_str)
+        self.log.addHandler(app.log_handler)
         self.log.setLevel(app.log.level)
 
         self.log.info("Checking for update...")
@@ -5,8 +5,12 @@ GNU General Public License v3.0.
 """
 
 import ctypes
+import logging
 import sys
+import threading
+from collections import deque
 from datetime import datetime
+from logging.handlers import QueueHandler
 from typing import Callable
 
 import psutil
@@ -45,22 +49,58 @@ class StdoutHandler(qtc.QObject):
     """
     Redirector class for sys.stdout.
 
-    Redirects sys.stdout to self.output_signal [QtCore.Signal].
+    Keeps the last <max_writes> writes in a ring buffer and emits
+    the latest non-empty write with self.output_signal [QtCore.Signal]
+    at most once every <interval> milliseconds.
     """
 
     output_signal = qtc.Signal(str)
 
-    def __init__(self, parent: qtc.QObject):
+    def __init__(
+        self, parent: qtc.QObject, max_writes: int = 10000, interval: int = 100
+    ):
         super().__init__(parent)
 
         self._stream = sys.stdout
         sys.stdout = self
-        self._content = ""
+        self._content: deque[str] = deque(maxlen=max_writes)
+        self._latest: str = None
+        self._lock = threading.Lock()
+
+        self._timer = qtc.QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush_signal)
+        self._timer.start()
 
     def write(self, text: str):
         self._stream.write(text)
-        self._content += text
-        self.output_signal.emit(text[:150])
+
+        with self._lock:
+            self._content.append(text)
+
+            # print() writes line breaks separately
+            if text.strip():
+                self._latest = text
+
+    def flush_signal(self):
+        """
+        Emits latest write if there was one since the last call.
+        """
+
+        with self._lock:
+            text = self._latest
+            self._latest = None
+
+        if text is not None:
+            self.output_signal.emit(text.strip()[:150])
+
+    def get_content(self):
+        """
+        Returns content of ring buffer.
+        """
+
+        with self._lock:
+            return "".join(self._content)
 
     def __getattr__(self, name: str):
         return getattr(self._stream, name)
@@ -72,6 +112,19 @@ class StdoutHandler(qtc.QObject):
             pass
 
 
+class LogQueueHandler(QueueHandler):
+    """
+    Passes log records to a queue without formatting them.
+
+    Records are formatted by the handlers of the QueueListener
+    in its own thread, so logging threads never block on them.
+    """
+
+    def prepare(self, record: logging.LogRecord):
+        # Records stay in this process and don't have to be pickled
+        return record
+
+
 def apply_dark_titlebar(widget: qtw.QWidget):
     """
     Applies dark title bar to <widget>.